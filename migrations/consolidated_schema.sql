@@ -765,6 +765,128 @@ CREATE TRIGGER update_qikink_products_updated_at
   FOR EACH ROW
   EXECUTE FUNCTION public.update_updated_at_column();
 
+-- ============================================
+-- BULK PRODUCT EDITS (scripts/upload_products.py)
+-- ============================================
+
+-- Index: Incremental refresh of the script's local catalog cache (rows changed since a timestamp)
+CREATE INDEX IF NOT EXISTS idx_products_updated_at ON public.products(updated_at);
+CREATE INDEX IF NOT EXISTS idx_categories_updated_at ON public.categories(updated_at);
+
+-- Function: ID fingerprint (row count and MD5 of the sorted IDs) of categories and products
+-- Lets the script's local catalog cache notice deleted rows without scanning every ID.
+CREATE OR REPLACE FUNCTION public.catalog_id_fingerprint()
+RETURNS JSONB
+SET search_path = ''
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT pg_catalog.jsonb_build_object(
+    'categories', (
+      SELECT pg_catalog.jsonb_build_object(
+        'count', pg_catalog.count(*),
+        'md5', pg_catalog.md5(COALESCE(pg_catalog.string_agg(c.id::TEXT, ',' ORDER BY c.id::TEXT COLLATE "C"), ''))
+      )
+      FROM public.categories c
+    ),
+    'products', (
+      SELECT pg_catalog.jsonb_build_object(
+        'count', pg_catalog.count(*),
+        'md5', pg_catalog.md5(COALESCE(pg_catalog.string_agg(p.id::TEXT, ',' ORDER BY p.id::TEXT COLLATE "C"), ''))
+      )
+      FROM public.products p
+    )
+  );
+$$;
+
+COMMENT ON FUNCTION public.catalog_id_fingerprint() IS 'Row count and MD5 of the sorted IDs of categories and products. Used by the script''s local catalog cache to detect deleted rows. Secured with immutable search_path.';
+
+-- Function: Set or remove variants.sizes on every product matching a selector
+-- NULL selector arguments are ignored; at least one must be given.
+CREATE OR REPLACE FUNCTION public.bulk_set_product_sizes(
+  new_sizes JSONB,
+  product_ids UUID[] DEFAULT NULL,
+  product_skus TEXT[] DEFAULT NULL,
+  filter_category_id UUID DEFAULT NULL,
+  filter_tags TEXT[] DEFAULT NULL,
+  filter_sku_prefix TEXT DEFAULT NULL,
+  filter_active BOOLEAN DEFAULT NULL
+)
+RETURNS INTEGER
+SET search_path = ''
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  affected INTEGER;
+BEGIN
+  IF product_ids IS NULL AND product_skus IS NULL AND filter_category_id IS NULL
+     AND filter_tags IS NULL AND filter_sku_prefix IS NULL AND filter_active IS NULL THEN
+    RAISE EXCEPTION 'bulk_set_product_sizes requires at least one selector';
+  END IF;
+
+  UPDATE public.products p
+  SET variants = CASE
+    WHEN new_sizes IS NULL THEN COALESCE(p.variants, '{}'::JSONB) - 'sizes'
+    ELSE pg_catalog.jsonb_set(COALESCE(p.variants, '{}'::JSONB), '{sizes}', new_sizes)
+  END
+  WHERE (product_ids IS NULL OR p.id = ANY(product_ids))
+    AND (product_skus IS NULL OR p.sku = ANY(product_skus))
+    AND (filter_category_id IS NULL OR p.category_id = filter_category_id)
+    AND (filter_tags IS NULL OR p.tags @> filter_tags)
+    AND (filter_sku_prefix IS NULL OR pg_catalog.starts_with(p.sku, filter_sku_prefix))
+    AND (filter_active IS NULL OR p.is_active = filter_active)
+    AND (new_sizes IS NOT NULL OR p.variants ? 'sizes');
+
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$;
+
+COMMENT ON FUNCTION public.bulk_set_product_sizes(JSONB, UUID[], TEXT[], UUID, TEXT[], TEXT, BOOLEAN) IS 'Sets variants.sizes (or removes it when new_sizes is NULL) for all matching products in one statement. Used by the add-sizes/remove-sizes script commands. Secured with immutable search_path.';
+
+-- Function: Deactivate (or delete) every product whose SKU is not in keep_skus
+-- Products without a SKU are never touched; an empty keep list is refused.
+CREATE OR REPLACE FUNCTION public.clean_products_not_in(
+  keep_skus TEXT[],
+  delete_rows BOOLEAN DEFAULT FALSE
+)
+RETURNS INTEGER
+SET search_path = ''
+LANGUAGE plpgsql
+AS $$
+DECLARE
+  affected INTEGER;
+BEGIN
+  IF keep_skus IS NULL OR pg_catalog.cardinality(keep_skus) = 0 THEN
+    RAISE EXCEPTION 'clean_products_not_in requires at least one SKU to keep';
+  END IF;
+
+  IF delete_rows THEN
+    DELETE FROM public.products p
+    WHERE p.sku IS NOT NULL
+      AND NOT (p.sku = ANY(keep_skus));
+  ELSE
+    UPDATE public.products p
+    SET is_active = FALSE
+    WHERE p.sku IS NOT NULL
+      AND p.is_active
+      AND NOT (p.sku = ANY(keep_skus));
+  END IF;
+
+  GET DIAGNOSTICS affected = ROW_COUNT;
+  RETURN affected;
+END;
+$$;
+
+COMMENT ON FUNCTION public.clean_products_not_in(TEXT[], BOOLEAN) IS 'Deactivates (or deletes) all products with a SKU outside keep_skus in one statement. Used by the clean script command. Secured with immutable search_path.';
+
+-- Bulk write functions are for the product scripts only (run with the service role key).
+-- Supabase grants EXECUTE on new public functions to anon and authenticated by default, so revoke it explicitly.
+REVOKE EXECUTE ON FUNCTION public.bulk_set_product_sizes(JSONB, UUID[], TEXT[], UUID, TEXT[], TEXT, BOOLEAN) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.clean_products_not_in(TEXT[], BOOLEAN) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION public.bulk_set_product_sizes(JSONB, UUID[], TEXT[], UUID, TEXT[], TEXT, BOOLEAN) TO service_role;
+GRANT EXECUTE ON FUNCTION public.clean_products_not_in(TEXT[], BOOLEAN) TO service_role;
+
 -- ============================================
 -- MIGRATION COMPLETE
 -- ============================================
@@ -776,6 +898,8 @@ CREATE TRIGGER update_qikink_products_updated_at
 -- - Qikink SKU Catalog (qikink_products table with 2,668 variants across 132 product types)
 -- - Schema modifications (orders with user_id, Qikink fields, and discount fields, categories.is_active, products.featured, products detail fields, order_items variants, user_profiles newsletter tracking, products.qikink_product_type and qikink_gender)
 -- - Security functions (hardened with search_path)
+-- - Bulk product script functions (bulk_set_product_sizes, clean_products_not_in; service_role only)
+-- - Catalog cache fingerprint function (catalog_id_fingerprint)
 -- - Automated triggers (updated_at, order numbers, first purchase tracking, discount usage increment)
 -- - Row Level Security policies (optimized for performance)
 -- - Comprehensive indexes and comments
@@ -0,0 +1,618 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the product sync pipeline in upload_products.py
+
+Generates a synthetic catalog (products-config.json plus one mockup folder
+per product) in a temporary directory and runs the sync against an
+in-process stand-in for Supabase's PostgREST and Storage APIs. Every
+request to the stand-in sleeps for --latency seconds (plus up to --jitter),
+so network-bound behaviour can be measured without a real project.
+
+Reports wall time, requests per kind and peak Python memory (tracemalloc)
+for each catalog size and scenario:
+  group      - group_mockups_by_color over every mockup folder (local only)
+  upload     - upload_mockups_to_storage for every product into empty storage
+  sync-cold  - sync_from_config against an empty backend
+  sync-warm  - sync_from_config again with nothing changed
+  gc         - gc_storage after a product's mockup was replaced while a past
+               order and a category still show the old image; fails if
+               either image is deleted or an orphan survives
+  cache      - resolve a product's SKU through the catalog cache after it was
+               inserted with an updated_at older than the cached ones (as
+               import restores them); fails if the cache misses it
+
+--startup instead times how long `upload_products.py` takes to print its
+usage screen (interpreter start plus module imports) and lists the slowest
+imports from `python -X importtime`. With --startup-budget it exits non-zero
+when the median exceeds the budget, so it can guard against a heavy import
+creeping back to module level.
+
+Usage:
+  python scripts/bench_sync.py                                  - 10 and 100 products, 13 colors x 4 views
+  python scripts/bench_sync.py --products 1000 --latency 0.05   - Bigger catalog, slower "network"
+  python scripts/bench_sync.py --scenarios sync-cold,sync-warm --jobs 8 --product-jobs 8
+  python scripts/bench_sync.py --json bench.json                - Also save the results as JSON
+  python scripts/bench_sync.py --startup --startup-budget 250   - Check CLI startup time
+
+The random data is seeded (--seed), so runs with the same options are
+reproducible. Requires the same packages as upload_products.py.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import uuid
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import upload_products  # noqa: E402
+
+SCENARIOS = ('group', 'upload', 'sync-cold', 'sync-warm', 'gc', 'cache')
+VIEW_NAMES = ('Front', 'Back', 'Left', 'Right', 'Closeup', 'Detail')
+
+# Column that upserts conflict on when the caller does not name one
+UNIQUE_KEYS = {'categories': 'slug', 'products': 'sku', 'qikink_products': 'qikink_sku'}
+
+class FakeResponse:
+    """Result of an execute() call, like postgrest's APIResponse"""
+
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+class FakeBackend:
+    """In-memory tables and storage objects shared by the fake client
+
+    Every request sleeps for the configured latency (outside the lock, so
+    concurrent requests overlap like real ones) and is counted by kind.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tables = {}
+        self.objects = {}
+        self.modified = {}
+        self.requests = Counter()
+
+    def request(self, kind):
+        with self.lock:
+            self.requests[kind] += 1
+            delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+    def rows(self, table):
+        return self.tables.setdefault(table, {})
+
+    def timestamp(self):
+        """updated_at for a written row, like the column default and the update trigger"""
+        return datetime.now(timezone.utc).isoformat()
+
+class FakeQuery:
+    """Subset of postgrest's query builder used by upload_products.py"""
+
+    def __init__(self, backend, table):
+        self.backend = backend
+        self.table = table
+        self.operation = 'select'
+        self.columns = '*'
+        self.payload = None
+        self.on_conflict = None
+        self.count = None
+        self.returning = None
+        self.filters = []
+        self.negate = False
+        self.order_by = None
+        self.limit_count = None
+        self.offset = 0
+
+    def select(self, columns='*', count=None):
+        self.columns = columns
+        self.count = count
+        return self
+
+    def insert(self, rows, **kwargs):
+        self.operation = 'insert'
+        self.payload = rows
+        return self
+
+    def upsert(self, rows, on_conflict=None, **kwargs):
+        self.operation = 'upsert'
+        self.payload = rows
+        self.on_conflict = on_conflict
+        return self
+
+    def update(self, values, count=None, returning=None):
+        self.operation = 'update'
+        self.payload = values
+        self.count = count
+        self.returning = returning
+        return self
+
+    def delete(self, count=None, returning=None):
+        self.operation = 'delete'
+        self.count = count
+        self.returning = returning
+        return self
+
+    def add_filter(self, check):
+        negate, self.negate = self.negate, False
+        self.filters.append((lambda row: not check(row)) if negate else check)
+        return self
+
+    @property
+    def not_(self):
+        self.negate = True
+        return self
+
+    def eq(self, column, value):
+        return self.add_filter(lambda row: row.get(column) == value)
+
+    def is_(self, column, value):
+        return self.add_filter(lambda row: row.get(column) is None)
+
+    def in_(self, column, values):
+        values = set(values)
+        return self.add_filter(lambda row: row.get(column) in values)
+
+    def gt(self, column, value):
+        return self.add_filter(lambda row: row.get(column) is not None and row[column] > value)
+
+    def gte(self, column, value):
+        return self.add_filter(lambda row: row.get(column) is not None and row[column] >= value)
+
+    def like(self, column, pattern):
+        prefix = pattern.rstrip('%').replace('\\', '')
+        return self.add_filter(lambda row: str(row.get(column) or '').startswith(prefix))
+
+    def contains(self, column, values):
+        return self.add_filter(lambda row: set(values) <= set(row.get(column) or []))
+
+    def order(self, column, desc=False):
+        self.order_by = (column, desc)
+        return self
+
+    def limit(self, count):
+        self.limit_count = count
+        return self
+
+    def range(self, start, end):
+        self.offset = start
+        self.limit_count = end - start + 1
+        return self
+
+    def matching(self, rows):
+        return [row for row in rows.values() if all(check(row) for check in self.filters)]
+
+    def project(self, row):
+        if self.columns.strip() == '*':
+            return dict(row)
+        return {column.strip(): row.get(column.strip()) for column in self.columns.split(',')}
+
+    def execute(self):
+        self.backend.request(f"db:{self.operation}")
+        with self.backend.lock:
+            rows = self.backend.rows(self.table)
+
+            if self.operation == 'select':
+                matched = self.matching(rows)
+                if self.order_by:
+                    column, desc = self.order_by
+                    matched.sort(key=lambda row: str(row.get(column)), reverse=desc)
+                total = len(matched)
+                matched = matched[self.offset:]
+                if self.limit_count is not None:
+                    matched = matched[:self.limit_count]
+                return FakeResponse([self.project(row) for row in matched], total if self.count else None)
+
+            if self.operation in ('insert', 'upsert'):
+                items = self.payload if isinstance(self.payload, list) else [self.payload]
+                key = self.on_conflict or UNIQUE_KEYS.get(self.table, 'id')
+                written = []
+                for item in items:
+                    existing = next((row for row in rows.values() if row.get(key) == item.get(key)), None) \
+                        if self.operation == 'upsert' and item.get(key) is not None else None
+                    if existing is None:
+                        existing = {'id': str(uuid.uuid4()), 'updated_at': self.backend.timestamp()}
+                        rows[existing['id']] = existing
+                    else:
+                        existing['updated_at'] = self.backend.timestamp()
+                    existing.update(json.loads(json.dumps(item)))
+                    written.append(dict(existing))
+                return FakeResponse(written)
+
+            matched = self.matching(rows)
+            if self.operation == 'update':
+                for row in matched:
+                    row.update(json.loads(json.dumps(self.payload)), updated_at=self.backend.timestamp())
+            else:
+                for row in matched:
+                    del rows[row['id']]
+            data = [] if self.returning == 'minimal' else [dict(row) for row in matched]
+            return FakeResponse(data, len(matched) if self.count else None)
+
+class FakeRPC:
+    """Stored procedure call; the benchmark backend defines none"""
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def execute(self):
+        self.backend.request('db:rpc')
+        raise RuntimeError({'code': 'PGRST202', 'message': f"Could not find the function public.{self.name}"})
+
+class FakeBucket:
+    """Subset of storage3's bucket API used by upload_products.py"""
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def list(self, path=None, options=None):
+        self.backend.request('storage:list')
+        options = options or {}
+        prefix = f"{path.strip('/')}/" if path else ''
+        entries = {}
+        with self.backend.lock:
+            for object_path, size in self.backend.objects.items():
+                if not object_path.startswith(prefix):
+                    continue
+                name, _, rest = object_path[len(prefix):].partition('/')
+                if rest:
+                    entries.setdefault(name, {'name': name, 'id': None, 'metadata': None})
+                else:
+                    entries[name] = {'name': name, 'id': object_path, 'metadata': {'size': size},
+                                     'updated_at': self.backend.modified.get(object_path)}
+        entries = sorted(entries.values(), key=lambda entry: entry['name'])
+        offset = options.get('offset', 0)
+        return entries[offset:offset + options.get('limit', 100)]
+
+    def upload(self, path, file, file_options=None):
+        size = len(file.read()) if hasattr(file, 'read') else os.path.getsize(file)
+        self.backend.request('storage:upload')
+        with self.backend.lock:
+            self.backend.objects[path] = size
+            self.backend.modified[path] = datetime.now(timezone.utc).isoformat()
+        return {'Key': f"{self.name}/{path}"}
+
+    def get_public_url(self, path):
+        return f"http://bench.invalid/storage/v1/object/public/{self.name}/{path}?"
+
+    def remove(self, paths):
+        self.backend.request('storage:remove')
+        with self.backend.lock:
+            for path in paths:
+                self.backend.objects.pop(path, None)
+                self.backend.modified.pop(path, None)
+        return [{'name': path} for path in paths]
+
+class FakeStorage:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def from_(self, bucket):
+        return FakeBucket(self.backend, bucket)
+
+class FakeClient:
+    """Stand-in for supabase.Client backed by a FakeBackend"""
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.storage = FakeStorage(backend)
+
+    def table(self, name):
+        return FakeQuery(self.backend, name)
+
+    def rpc(self, name, params=None):
+        return FakeRPC(self.backend, name)
+
+def generate_catalog(root, products, colors, views, image_kb, seed):
+    """Write products-config.json and mockups/ for a synthetic catalog into root"""
+    rng = random.Random(seed)
+    color_ids = list(upload_products.COLOR_MAP)[:colors]
+    image_size = image_kb * 1024
+
+    config_products = []
+    for number in range(1, products + 1):
+        folder = f"bench_{number:05d}"
+        mockup_dir = root / 'mockups' / folder
+        mockup_dir.mkdir(parents=True)
+
+        filenames = ['default.jpg', 'size_chart.jpg']
+        for color_id in color_ids:
+            for view in range(views):
+                filenames.append(f"{VIEW_NAMES[view % len(VIEW_NAMES)]}_{view // len(VIEW_NAMES) + 1}_c_{color_id}.jpg")
+        for filename in filenames:
+            (mockup_dir / filename).write_bytes(rng.randbytes(image_size))
+
+        config_products.append({
+            'name': f"Bench Product {number}",
+            'sku': f"BENCH-{number:05d}",
+            'mockup_folder': folder,
+            'description': f"Synthetic product {number}",
+            'tags': ['bench', f"group-{number % 10}"]
+        })
+
+    config = {
+        'categories': {
+            'bench': {
+                'name': 'Bench',
+                'description': 'Synthetic benchmark catalog',
+                'active': True,
+                'defaults': {
+                    'base_price': 999,
+                    'vendor': 'qikink',
+                    'product_type': 'hoodie',
+                    'variants': {'sizes': ['S', 'M', 'L', 'XL']}
+                },
+                'products': config_products
+            }
+        }
+    }
+    with open(root / 'products-config.json', 'w') as f:
+        json.dump(config, f, indent=2)
+
+def reset_local_state():
+    """Forget everything a previous run left behind in the working directory"""
+    upload_products.reset_run_state()
+    for path in (upload_products.SYNC_STATE_PATH, upload_products.SYNC_JOURNAL_PATH, upload_products.MOCKUP_INDEX_PATH):
+        Path(path).unlink(missing_ok=True)
+
+def prepare_gc_scenario(backend):
+    """Replace one product's mockup after it was ordered, and leave an orphan behind
+
+    Returns (paths that must survive gc_storage, path that must be deleted).
+    """
+    bucket = FakeBucket(backend, 'product-images')
+    public_prefix = bucket.get_public_url('')[:-1]
+    products = backend.rows('products')
+    product = products[min(products)]
+    old_url = product['images'][0]
+    new_url = old_url.replace('.jpg', '-v2.jpg')
+    old_path = old_url[len(public_prefix):]
+
+    # The re-uploaded mockup replaces every reference in the product row
+    products[product['id']] = json.loads(json.dumps(product).replace(old_url, new_url))
+    bucket.upload(new_url[len(public_prefix):], io.BytesIO(b'v2'))
+
+    # An order placed before the change, and a category image, still point at the old file
+    backend.rows('order_items')['bench-order-item'] = {'id': 'bench-order-item', 'variant_image': old_url}
+    backend.rows('categories')[next(iter(backend.rows('categories')))]['image_url'] = old_url
+    bucket.upload('retired-product/Front_1_c_1.jpg', io.BytesIO(b'orphan'))
+    return {old_path}, 'retired-product/Front_1_c_1.jpg'
+
+def prepare_cache_scenario(backend):
+    """Warm the catalog cache, then insert a product whose updated_at predates every cached one
+
+    Returns the new product's SKU.
+    """
+    upload_products.reset_run_state()
+    upload_products.get_catalog_cache()
+
+    products = backend.rows('products')
+    restored = dict(products[min(products)], id=str(uuid.uuid4()), sku=f"RESTORED-{len(products)}",
+                    updated_at='2000-01-01T00:00:00+00:00')
+    products[restored['id']] = restored
+
+    upload_products.mark_catalog_cache_stale()
+    upload_products.reset_run_state()
+    return restored['sku']
+
+def run_scenario(scenario, root, backend, options, verbose=False, trace_memory=True):
+    """Run one scenario and return its measurements"""
+    mockup_dirs = sorted((root / 'mockups').iterdir())
+    upload_products.supabase.use(FakeClient(backend))
+    upload_products.reset_run_state()
+    upload_products.set_request_limit(options.jobs)
+    backend.requests.clear()
+
+    output = sys.stdout if verbose else io.StringIO()
+    if trace_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+
+    with contextlib.redirect_stdout(output):
+        if scenario == 'group':
+            for mockup_dir in mockup_dirs:
+                upload_products.group_mockups_by_color(str(mockup_dir))
+        elif scenario == 'upload':
+            for mockup_dir in mockup_dirs:
+                upload_products.upload_mockups_to_storage(str(mockup_dir), mockup_dir.name, jobs=options.jobs)
+        elif scenario == 'gc':
+            # gc_storage only deletes with the service role key; the fake client never checks it
+            os.environ.setdefault('NEXT_PUBLIC_SUPABASE_URL', 'http://bench.invalid')
+            os.environ.setdefault('SUPABASE_SERVICE_ROLE_KEY', 'bench.bench.bench')
+            keep, orphan = prepare_gc_scenario(backend)
+            backend.requests.clear()
+            upload_products.gc_storage(grace_hours=0, jobs=options.jobs)
+        elif scenario == 'cache':
+            restored_sku = prepare_cache_scenario(backend)
+            backend.requests.clear()
+            resolved = upload_products.resolve_product_ids([restored_sku])
+        else:
+            upload_products.sync_from_config(
+                jobs=options.jobs,
+                product_jobs=options.product_jobs,
+                batch_size=options.batch_size,
+                dedupe=options.dedupe
+            )
+
+    elapsed = time.perf_counter() - started
+    peak = 0
+    if trace_memory:
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    if scenario == 'gc':
+        if keep - set(backend.objects):
+            raise RuntimeError(f"gc_storage deleted images that are still referenced: {', '.join(sorted(keep - set(backend.objects)))}")
+        if orphan in backend.objects:
+            raise RuntimeError(f"gc_storage kept the unreferenced object {orphan}")
+    if scenario == 'cache' and restored_sku not in resolved:
+        raise RuntimeError(f"catalog cache missed {restored_sku}, inserted with an old updated_at")
+
+    return {
+        'scenario': scenario,
+        'wall_seconds': elapsed,
+        'requests': dict(sorted(backend.requests.items())),
+        'peak_memory_bytes': peak
+    }
+
+def run_benchmark(options):
+    """Run every scenario for every catalog size and return the measurements"""
+    results = []
+    original_cwd = Path.cwd()
+
+    for products in options.products:
+        root = Path(tempfile.mkdtemp(prefix='bench-sync-'))
+        try:
+            generate_catalog(root, products, options.colors, options.views, options.image_kb, options.seed)
+            os.chdir(root)
+            backend = FakeBackend(options.latency, options.jitter, options.seed)
+
+            for scenario in options.scenarios:
+                # Cold runs start from an empty backend and no manifest; warm runs reuse both
+                if scenario in ('upload', 'sync-cold'):
+                    backend.tables.clear()
+                    backend.objects.clear()
+                    reset_local_state()
+                if scenario in ('sync-warm', 'gc', 'cache') and not backend.tables:
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        upload_products.supabase.use(FakeClient(backend))
+                        upload_products.sync_from_config(jobs=options.jobs, product_jobs=options.product_jobs,
+                                                         batch_size=options.batch_size, dedupe=options.dedupe)
+
+                for repeat in range(options.repeat):
+                    result = run_scenario(scenario, root, backend, options, options.verbose, not options.no_tracemalloc)
+                    result.update(products=products, files=products * (options.colors * options.views + 2), repeat=repeat)
+                    results.append(result)
+                    print_result(result)
+        finally:
+            os.chdir(original_cwd)
+            upload_products.shutdown_image_pool()
+            shutil.rmtree(root, ignore_errors=True)
+
+    return results
+
+def measure_startup(runs):
+    """Median wall time of `upload_products.py` (usage screen) and its slowest imports"""
+    script = Path(upload_products.__file__).resolve()
+    timings = []
+    imports = {}
+
+    for _ in range(runs):
+        started = time.perf_counter()
+        completed = subprocess.run([sys.executable, '-X', 'importtime', str(script)],
+                                   capture_output=True, text=True, cwd=tempfile.gettempdir())
+        timings.append(time.perf_counter() - started)
+        if completed.returncode != 0:
+            raise RuntimeError(f"upload_products.py exited with {completed.returncode}: {completed.stderr[-500:]}")
+
+        # Lines look like "import time:   self [us] | cumulative | package"; keep top-level imports only
+        for line in completed.stderr.splitlines():
+            parts = line.split('|')
+            if not line.startswith('import time:') or len(parts) != 3 or not parts[1].strip().isdigit():
+                continue
+            name = parts[2].rstrip()
+            if name.startswith(' ') and not name.startswith('  '):
+                imports.setdefault(name.strip(), []).append(int(parts[1]) / 1_000_000)
+
+    slowest = sorted(((statistics.median(times), name) for name, times in imports.items()), reverse=True)
+    return statistics.median(timings), slowest
+
+def run_startup(options):
+    """Print the startup measurement; returns False when it exceeds --startup-budget"""
+    runs = max(options.repeat, 5)
+    median, slowest = measure_startup(runs)
+
+    print(f"[BENCH] upload_products.py startup (usage screen), median of {runs} run(s): {median * 1000:.0f} ms\n")
+    print(f"{'Import':<40} {'Cumulative':>12}")
+    print("-" * 53)
+    for seconds, name in slowest[:10]:
+        print(f"{name:<40} {seconds * 1000:>9.1f} ms")
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump({'startup_seconds': median, 'runs': runs,
+                       'imports': {name: seconds for seconds, name in slowest}}, f, indent=2)
+        print(f"\n[OK] Wrote results to {options.json}")
+
+    if options.startup_budget is not None and median * 1000 > options.startup_budget:
+        print(f"\n[X] Startup took {median * 1000:.0f} ms, over the {options.startup_budget:g} ms budget")
+        return False
+    return True
+
+def print_result(result):
+    requests = result['requests']
+    summary = ', '.join(f"{kind}={count}" for kind, count in requests.items()) or '-'
+    print(f"{result['products']:>8} {result['scenario']:<10} {result['wall_seconds']:>9.3f}s "
+          f"{sum(requests.values()):>9} {result['peak_memory_bytes'] / (1024 * 1024):>9.1f} MB  {summary}")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Benchmark the product sync pipeline against an in-process fake backend')
+    parser.add_argument('--products', default='10,100', help='Comma-separated catalog sizes (default: 10,100)')
+    parser.add_argument('--colors', type=int, default=13, help='Colors per product (default: 13, max %d)' % len(upload_products.COLOR_MAP))
+    parser.add_argument('--views', type=int, default=4, help='Views per color (default: 4)')
+    parser.add_argument('--image-kb', type=int, default=8, help='Size of each synthetic mockup in KB (default: 8)')
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"Comma-separated scenarios (default: {','.join(SCENARIOS)})")
+    parser.add_argument('--latency', type=float, default=0.01, help='Seconds added to every request (default: 0.01)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency per request, up to this many seconds')
+    parser.add_argument('--jobs', type=int, default=upload_products.DEFAULT_UPLOAD_JOBS, help='--jobs passed to the sync')
+    parser.add_argument('--product-jobs', type=int, default=upload_products.DEFAULT_PRODUCT_JOBS, help='--product-jobs passed to the sync')
+    parser.add_argument('--batch-size', type=int, default=upload_products.DEFAULT_BATCH_SIZE, help='--batch-size passed to the sync')
+    parser.add_argument('--dedupe', action='store_true', help='Sync with --dedupe')
+    parser.add_argument('--repeat', type=int, default=1, help='Runs per scenario (default: 1)')
+    parser.add_argument('--seed', type=int, default=1, help='Random seed for the synthetic data (default: 1)')
+    parser.add_argument('--no-tracemalloc', action='store_true', help='Skip memory tracing (it slows Python code down)')
+    parser.add_argument('--json', help='Also write the results to this JSON file')
+    parser.add_argument('--verbose', action='store_true', help='Show the script output of every run')
+    parser.add_argument('--startup', action='store_true', help='Measure CLI startup time instead of the sync')
+    parser.add_argument('--startup-budget', type=float, help='With --startup: fail if the median exceeds this many ms')
+
+    options = parser.parse_args()
+    options.products = [int(value) for value in options.products.split(',') if value.strip()]
+    options.scenarios = [value.strip() for value in options.scenarios.split(',') if value.strip()]
+    unknown = set(options.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    options.colors = max(1, min(options.colors, len(upload_products.COLOR_MAP)))
+    return options
+
+def main():
+    options = parse_args()
+
+    if options.startup:
+        sys.exit(0 if run_startup(options) else 1)
+
+    print(f"[BENCH] {options.colors} color(s) x {options.views} view(s) per product, "
+          f"{options.image_kb} KB per image, {options.latency * 1000:g} ms latency per request\n")
+    print(f"{'Products':>8} {'Scenario':<10} {'Wall':>10} {'Requests':>9} {'Peak mem':>12}  By kind")
+    print("-" * 100)
+
+    results = run_benchmark(options)
+
+    if options.json:
+        with open(options.json, 'w') as f:
+            json.dump({'options': {key: value for key, value in vars(options).items() if key != 'json'},
+                       'results': results}, f, indent=2)
+        print(f"\n[OK] Wrote results to {options.json}")
+
+if __name__ == '__main__':
+    main()
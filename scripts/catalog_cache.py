@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Local SQLite copy of the products and categories tables
+
+Read commands in upload_products.py (list, category lookups, SKU -> ID)
+are answered from .sync-cache/catalog.sqlite. Before use the cache is
+brought up to date by fetching only the rows whose updated_at is at or
+after the newest one already cached; rows deleted remotely are noticed by
+comparing a fingerprint of the IDs (count plus an MD5 of the sorted IDs)
+and pruned with an ID-only scan. A cache refreshed in the last few seconds
+is used as-is, so loops of single commands don't pay for a refresh each.
+
+This module only stores and queries rows; fetching them from Supabase is
+done by upload_products.refresh_catalog_cache().
+
+Usage:
+  python scripts/catalog_cache.py              - Show what the cache holds
+  python scripts/catalog_cache.py clear        - Delete the cache
+"""
+
+import hashlib
+import json
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+CACHE_PATH = Path('.sync-cache') / 'catalog.sqlite'
+CACHE_VERSION = 1
+
+# Cached tables and the columns kept in indexed form (every row is also stored whole as JSON)
+TABLE_COLUMNS = {
+    'categories': ['id', 'slug', 'name', 'is_active', 'updated_at'],
+    'products': ['id', 'sku', 'name', 'price', 'is_active', 'category_id', 'updated_at']
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    slug TEXT,
+    name TEXT,
+    is_active INTEGER,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS categories_slug ON categories(slug);
+CREATE TABLE IF NOT EXISTS products (
+    id TEXT PRIMARY KEY,
+    sku TEXT,
+    name TEXT,
+    price REAL,
+    is_active INTEGER,
+    category_id TEXT,
+    updated_at TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS products_sku ON products(sku);
+CREATE INDEX IF NOT EXISTS products_category ON products(category_id);
+"""
+
+def parse_timestamp(value):
+    """datetime for a PostgREST timestamp, or None if it cannot be parsed"""
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+def like_prefix(prefix):
+    """SQL LIKE pattern matching values that start with prefix literally"""
+    return prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+
+class CatalogCache:
+    """SQLite-backed copy of the catalog tables"""
+
+    def __init__(self, path=CACHE_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.path)
+        # Match PostgREST: LIKE is case-sensitive (search lowercases both sides itself)
+        self.db.execute("PRAGMA case_sensitive_like = ON")
+        self.db.executescript(SCHEMA)
+        if self.get_meta('version') != str(CACHE_VERSION):
+            self.clear()
+
+    def close(self):
+        self.db.close()
+
+    def get_meta(self, name):
+        row = self.db.execute("SELECT value FROM meta WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, name, value):
+        self.db.execute("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)", (name, value))
+
+    def clear(self):
+        """Forget every cached row"""
+        with self.db:
+            for table in TABLE_COLUMNS:
+                self.db.execute(f"DELETE FROM {table}")
+            self.db.execute("DELETE FROM meta")
+            self.set_meta('version', str(CACHE_VERSION))
+
+    def high_water(self, table):
+        """Newest updated_at cached for a table (as sent by the server), or None"""
+        return self.get_meta(f"{table}.updated_at")
+
+    def store(self, table, rows):
+        """Insert or replace rows and advance the table's high-water mark
+
+        Returns the number of rows that were new or differed from the cached copy.
+        """
+        columns = TABLE_COLUMNS[table]
+        newest = self.high_water(table)
+        newest_time = parse_timestamp(newest) if newest else None
+        changed = 0
+
+        with self.db:
+            for row in rows:
+                data = json.dumps(row)
+                cached = self.db.execute(f"SELECT data FROM {table} WHERE id = ?", (row.get('id'),)).fetchone()
+                if cached and cached[0] == data:
+                    continue
+                changed += 1
+                values = [row.get(column) for column in columns]
+                self.db.execute(
+                    f"INSERT OR REPLACE INTO {table} ({', '.join(columns)}, data) "
+                    f"VALUES ({', '.join('?' * (len(columns) + 1))})",
+                    values + [data]
+                )
+                updated = parse_timestamp(row.get('updated_at')) if row.get('updated_at') else None
+                if updated and (newest_time is None or updated > newest_time):
+                    newest, newest_time = row['updated_at'], updated
+            if newest:
+                self.set_meta(f"{table}.updated_at", newest)
+
+        return changed
+
+    def remove(self, table, ids):
+        """Drop rows by ID"""
+        with self.db:
+            self.db.executemany(f"DELETE FROM {table} WHERE id = ?", [(row_id,) for row_id in ids])
+
+    def fingerprint(self, table):
+        """(row count, MD5 of the comma-joined sorted IDs), as computed by catalog_id_fingerprint()"""
+        ids = sorted(str(row_id) for row_id in self.ids(table))
+        return len(ids), hashlib.md5(','.join(ids).encode('utf-8')).hexdigest()
+
+    def refreshed_within(self, seconds):
+        """Whether the cache was last refreshed less than `seconds` ago"""
+        refreshed_at = self.get_meta('refreshed_at')
+        return refreshed_at is not None and time.time() - float(refreshed_at) < seconds
+
+    def mark_refreshed(self):
+        with self.db:
+            self.set_meta('refreshed_at', str(time.time()))
+
+    def mark_stale(self):
+        """Make the next use refresh the cache (after this tool wrote to the database)"""
+        with self.db:
+            self.db.execute("DELETE FROM meta WHERE name = 'refreshed_at'")
+
+    def count(self, table):
+        return self.db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+    def ids(self, table):
+        return {row[0] for row in self.db.execute(f"SELECT id FROM {table}")}
+
+    def category_id(self, slug):
+        """ID of the category with this slug, or None"""
+        row = self.db.execute("SELECT id FROM categories WHERE slug = ?", (slug,)).fetchone()
+        return row[0] if row else None
+
+    def product_ids_by_sku(self, skus):
+        """{sku: id} for the cached products with these SKUs"""
+        result = {}
+        skus = list(skus)
+        # Stay under SQLite's bound-parameter limit
+        for start in range(0, len(skus), 500):
+            chunk = skus[start:start + 500]
+            result.update(self.db.execute(
+                f"SELECT sku, id FROM products WHERE sku IN ({', '.join('?' * len(chunk))})", chunk
+            ).fetchall())
+        return result
+
+    def products(self, category_id=None, tags=None, active=None, sku_prefix=None, search=None):
+        """Yield cached products (as dicts) matching the same filters as upload_products.product_filters
+
+        search matches name or SKU, case-insensitively.
+        """
+        conditions = []
+        params = []
+        if category_id:
+            conditions.append("category_id = ?")
+            params.append(category_id)
+        if active is not None:
+            conditions.append("is_active = ?")
+            params.append(1 if active else 0)
+        if sku_prefix:
+            conditions.append("sku LIKE ? ESCAPE '\\'")
+            params.append(like_prefix(sku_prefix))
+        if search:
+            conditions.append("(lower(name) LIKE ? ESCAPE '\\' OR lower(sku) LIKE ? ESCAPE '\\')")
+            pattern = '%' + like_prefix(search.lower())
+            params.extend([pattern, pattern])
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+        for (data,) in self.db.execute(f"SELECT data FROM products {where} ORDER BY id", params):
+            product = json.loads(data)
+            if tags and not set(tags) <= set(product.get('tags') or []):
+                continue
+            yield product
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == 'clear':
+        CACHE_PATH.unlink(missing_ok=True)
+        print(f"[OK] Deleted {CACHE_PATH}")
+        return
+
+    if not CACHE_PATH.exists():
+        print(f"[X] No cache at {CACHE_PATH} (run e.g. `python scripts/upload_products.py list` to build it)")
+        return
+
+    cache = CatalogCache()
+    for table in TABLE_COLUMNS:
+        print(f"[OK] {table}: {cache.count(table)} row(s), newest updated_at {cache.high_water(table) or '-'}")
+    cache.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Qikink SKU index built from Qikink_skus.csv
+
+Parses the CSV once into lookup tables keyed by
+(gender, product_type, color_name, size) and by (style_code, color_code, size).
+The parsed index is pickled to .sync-cache/ and only rebuilt when the CSV
+changes, so lookups during a sync cost microseconds instead of a
+qikink_products query per variant.
+
+Rows follow the same format as scripts/import-qikink-skus.ts, so they can be
+written to the qikink_products table as-is.
+
+Usage:
+  python scripts/qikink_sku_index.py                        - Build the index and print a summary
+  python scripts/qikink_sku_index.py <type> <color> <size>  - Look up a single SKU
+"""
+
+import csv
+import os
+import pickle
+import re
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+CSV_PATH = Path('Qikink_skus.csv')
+CACHE_PATH = Path('.sync-cache') / 'qikink_skus.pickle'
+CACHE_VERSION = 1
+
+GENDER_MAP = {
+    'M': 'Male',
+    'F': 'Female',
+    'B': 'Baby/Kids',
+    'U': 'Unisex'
+}
+
+# One row of qikink_products (metadata fields flattened)
+QikinkSku = namedtuple('QikinkSku', [
+    'qikink_sku', 'product_type', 'gender', 'style_code', 'color_code', 'color_name',
+    'size', 'base_price', 'shipping_weight', 'tax_rate', 'description'
+])
+
+def parse_sku(sku):
+    """Split a SKU like MVnHs-Rd-L into (gender code, style code, color code, size)"""
+    parts = sku.split('-')
+    if len(parts) != 3 or len(parts[0]) < 2:
+        raise ValueError(f"Invalid SKU format: {sku}")
+    return parts[0][0], parts[0][1:], parts[1], parts[2]
+
+def clean_product_type(category_name):
+    """Remove Qikink style codes like '| UV34' from a category name"""
+    return re.sub(r'\s*\|\s*[A-Z0-9]+\s*$', '', category_name).strip()
+
+def to_number(value):
+    """Parse a numeric CSV cell, treating blanks and junk as 0"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def parse_csv_row(row):
+    """Convert one CSV row into a QikinkSku"""
+    sku = row['SKU'].strip()
+    gender_code, style_code, color_code, size = parse_sku(sku)
+    return QikinkSku(
+        qikink_sku=sku,
+        product_type=clean_product_type(row['Category Name']),
+        gender=GENDER_MAP.get(gender_code, gender_code),
+        style_code=style_code,
+        color_code=color_code,
+        color_name=row['Color Name'].strip(),
+        size=size,
+        base_price=to_number(row['Base Price']),
+        shipping_weight=to_number(row['Shipping Weight']),
+        tax_rate=to_number(row['Tax Rate %']),
+        description=row['Product Description'].strip()
+    )
+
+def read_csv(csv_path=CSV_PATH):
+    """Stream (line number, QikinkSku or error message) pairs from the CSV"""
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            try:
+                yield line_number, parse_csv_row(row)
+            except (KeyError, ValueError, AttributeError) as e:
+                yield line_number, str(e)
+
+def to_db_row(sku):
+    """qikink_products row for a QikinkSku (same shape as the TypeScript importer)"""
+    return {
+        'qikink_sku': sku.qikink_sku,
+        'product_type': sku.product_type,
+        'gender': sku.gender,
+        'style_code': sku.style_code,
+        'color_code': sku.color_code,
+        'color_name': sku.color_name,
+        'size': sku.size,
+        'base_price': sku.base_price,
+        'metadata': {
+            'shipping_weight': sku.shipping_weight,
+            'tax_rate': sku.tax_rate,
+            'description': sku.description
+        }
+    }
+
+def _key(*parts):
+    """Case-insensitive lookup key"""
+    return tuple(str(part).strip().lower() for part in parts)
+
+class QikinkSkuIndex:
+    """In-memory SKU lookup tables"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.by_sku = {}
+        self.by_variant = {}
+        self.by_variant_any_gender = {}
+        self.by_code = {}
+
+        for index, row in enumerate(rows):
+            self.by_sku[row.qikink_sku] = index
+            self.by_variant.setdefault(_key(row.gender, row.product_type, row.color_name, row.size), index)
+            self.by_variant_any_gender.setdefault(_key(row.product_type, row.color_name, row.size), index)
+            self.by_code.setdefault(_key(row.style_code, row.color_code, row.size), index)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def get(self, qikink_sku):
+        """Row for an exact Qikink SKU"""
+        index = self.by_sku.get(qikink_sku)
+        return self.rows[index] if index is not None else None
+
+    def lookup(self, product_type, color_name, size, gender=None):
+        """Row for a product type / color / size, optionally narrowed by gender"""
+        if gender:
+            index = self.by_variant.get(_key(GENDER_MAP.get(gender, gender), product_type, color_name, size))
+        else:
+            index = self.by_variant_any_gender.get(_key(product_type, color_name, size))
+        return self.rows[index] if index is not None else None
+
+    def lookup_code(self, style_code, color_code, size):
+        """Row for a style code / color code / size"""
+        index = self.by_code.get(_key(style_code, color_code, size))
+        return self.rows[index] if index is not None else None
+
+def build_index(csv_path=CSV_PATH):
+    """Parse the CSV into a QikinkSkuIndex, skipping rows with invalid SKUs"""
+    rows = [item for _, item in read_csv(csv_path) if isinstance(item, QikinkSku)]
+    return QikinkSkuIndex(rows)
+
+def load_index(csv_path=CSV_PATH, cache_path=CACHE_PATH):
+    """Load the index from cache, rebuilding it if the CSV changed"""
+    stat = os.stat(csv_path)
+    signature = (CACHE_VERSION, stat.st_mtime_ns, stat.st_size)
+
+    try:
+        with open(cache_path, 'rb') as f:
+            cached_signature, rows = pickle.load(f)
+        if cached_signature == signature:
+            return QikinkSkuIndex([QikinkSku(*row) for row in rows])
+    except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+        pass
+
+    index = build_index(csv_path)
+
+    cache_path = Path(cache_path)
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = cache_path.with_name(cache_path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        pickle.dump((signature, [tuple(row) for row in index.rows]), f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+    return index
+
+def main():
+    if not CSV_PATH.exists():
+        print(f"[X] {CSV_PATH} not found in root directory")
+        return
+
+    index = load_index()
+
+    if len(sys.argv) >= 4:
+        product_type, color_name, size = sys.argv[1:4]
+        gender = sys.argv[4] if len(sys.argv) > 4 else None
+        row = index.lookup(product_type, color_name, size, gender)
+        if row:
+            print(f"[OK] {row.qikink_sku} - {row.description} (base price {row.base_price:g}, weight {row.shipping_weight:g}g)")
+        else:
+            print(f"[X] No Qikink SKU for {product_type} / {color_name} / {size}")
+        return
+
+    product_types = sorted({row.product_type for row in index.rows})
+    print(f"[OK] Indexed {len(index)} Qikink SKUs across {len(product_types)} product types")
+
+if __name__ == '__main__':
+    main()
@@ -1,37 +1,430 @@
 #!/usr/bin/env python3
 
+import base64
+import csv
+import hashlib
 import json
+import mimetypes
 import os
+import random
 import sys
 import re
+import threading
+import time
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from pathlib import Path
-from dotenv import load_dotenv
-from supabase import create_client, Client
+from urllib.parse import unquote
+
+# The Supabase SDK, httpx, dotenv and multiprocessing are imported where they
+# are first needed, so the usage screen and purely local commands start fast.
+
+# Seconds before a single database/storage request times out
+REQUEST_TIMEOUT = 60
+
+@lru_cache(maxsize=None)
+def supabase_credentials():
+    """(URL, key) from .env.local or the environment; exits if they are missing"""
+    from dotenv import load_dotenv
+    load_dotenv('.env.local')
+
+    url = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
+    # Try service role key first (for admin operations), fall back to anon key
+    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
+
+    if not url or not key:
+        print("[X] Please set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env.local")
+        sys.exit(1)
+    return url, key
 
-# Load environment variables
-load_dotenv('.env.local')
+class LazyClient:
+    """The Supabase client (OFFICIAL SDK), created on first use
 
-SUPABASE_URL = os.getenv('NEXT_PUBLIC_SUPABASE_URL')
-# Try service role key first (for admin operations), fall back to anon key
-SUPABASE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('NEXT_PUBLIC_SUPABASE_ANON_KEY')
+    One client is shared by every command and thread, so its pooled HTTP
+    connections are reused. Attribute access (supabase.table, .storage,
+    .rpc) is forwarded to it.
+    """
 
-if not SUPABASE_URL or not SUPABASE_KEY:
-    print("[X] Please set NEXT_PUBLIC_SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY in .env.local")
-    sys.exit(1)
+    def __init__(self):
+        self._client = None
+        self._lock = threading.Lock()
+
+    def _get(self):
+        if self._client is not None:
+            return self._client
+        with self._lock:
+            if self._client is None:
+                from supabase import create_client
+                from supabase.lib.client_options import ClientOptions
+
+                url, key = supabase_credentials()
+                self._client = create_client(url, key, options=ClientOptions(
+                    postgrest_client_timeout=REQUEST_TIMEOUT,
+                    storage_client_timeout=REQUEST_TIMEOUT
+                ))
+            return self._client
+
+    def use(self, client):
+        """Use `client` (e.g. a fake backend) instead of creating one"""
+        with self._lock:
+            self._client = client
+
+    def __getattr__(self, name):
+        return getattr(self._get(), name)
+
+supabase = LazyClient()
+
+# Number of mockup files uploaded in parallel (override with --jobs N).
+# sync-config also uses it as the cap on in-flight storage/database requests.
+DEFAULT_UPLOAD_JOBS = 4
+
+# Retries for rate-limited (429), server-side (5xx) and network failures,
+# with jittered exponential backoff between RETRY_BASE_DELAY and RETRY_MAX_DELAY seconds
+REQUEST_RETRIES = 5
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30
+RETRYABLE_STATUS = {408, 425, 429, 500, 502, 503, 504}
+
+# Number of products sync-config processes at once (override with --product-jobs N)
+DEFAULT_PRODUCT_JOBS = 4
+
+# Rows per multi-row upsert request (override with --batch-size N)
+DEFAULT_BATCH_SIZE = 100
+
+# Rows per page when reading whole tables (PostgREST's default max-rows)
+DB_PAGE_SIZE = 1000
+
+# SKUs per request when selecting products from a SKU list (keeps request URLs short)
+SKU_FILTER_CHUNK_SIZE = 200
+
+# Columns sync-config writes, fetched to diff local config against the database
+CATEGORY_SYNC_COLUMNS = ['id', 'name', 'slug', 'description', 'is_active']
+PRODUCT_SYNC_COLUMNS = [
+    'id', 'name', 'description', 'price', 'compare_at_price', 'sku', 'category_id', 'images',
+    'is_active', 'vendor', 'product_type', 'material', 'variants', 'tags'
+]
+
+# Rows per upsert request when importing Qikink_skus.csv
+QIKINK_IMPORT_BATCH_SIZE = 500
+
+# Maximum number of entries Supabase Storage returns per list() call
+STORAGE_LIST_PAGE_SIZE = 100
+
+# Files larger than this go through Storage's resumable (TUS) endpoint, read
+# and sent one chunk at a time instead of being loaded into memory whole.
+# Supabase requires 6 MB chunks.
+RESUMABLE_UPLOAD_THRESHOLD = 6 * 1024 * 1024
+RESUMABLE_CHUNK_SIZE = 6 * 1024 * 1024
+
+# Local manifest of what sync-config last pushed (file and product payload hashes)
+SYNC_STATE_PATH = Path('.sync-state.json')
+SYNC_STATE_VERSION = 1
+
+# Steps completed by the current sync-config run, kept until the run finishes (see --resume)
+SYNC_JOURNAL_PATH = Path('.sync-journal.jsonl')
+
+# Parsed mockup folder listings, reused while a folder's mtime is unchanged
+MOCKUP_INDEX_PATH = Path('.sync-cache') / 'mockups.json'
+MOCKUP_INDEX_VERSION = 1
+
+# watch: seconds without further changes before syncing, and polling interval without watchdog
+WATCH_DEBOUNCE = 1.0
+WATCH_POLL_INTERVAL = 1.0
+
+# Seconds a refreshed catalog cache is trusted without asking the database again
+CATALOG_CACHE_MAX_AGE = 5
+
+# Commands that never write to the catalog tables (others invalidate the catalog cache)
+READ_ONLY_COMMANDS = {'list', 'export'}
+
+# Content-addressed objects (--dedupe) live under cas/<first 2 hex chars of sha256>/
+CONTENT_ADDRESSED_PREFIX = 'cas'
+
+# gc-storage: unreferenced objects younger than this are kept, and paths removed per request
+GC_GRACE_HOURS = 24
+STORAGE_REMOVE_BATCH_SIZE = 100
+
+# export/import: snapshot tables (in restore order) with the column upserts match on, and rows per upsert
+# Snapshot tables and the natural key import matches their rows on (like sync-config and import-skus)
+SNAPSHOT_TABLES = {'categories': 'slug', 'products': 'sku', 'qikink_products': 'qikink_sku'}
+SNAPSHOT_FORMAT = 'catalog-snapshot'
+SNAPSHOT_VERSION = 1
+SNAPSHOT_BATCH_SIZE = 500
+
+# Optimized renditions generated with --optimize (requires Pillow)
+RENDITION_WIDTHS = (400, 800, 1200)
+RENDITION_FORMATS = ('webp', 'avif')
+RENDITION_QUALITY = {'webp': 80, 'avif': 60}
+# Encoded renditions are cached by source hash so unchanged images are never re-encoded
+RENDITION_CACHE_DIR = Path('.sync-cache') / 'renditions'
+
+# Color mapping (Qikink color IDs). qikink_name is set where Qikink_skus.csv
+# uses a different color name than the storefront.
+COLOR_MAP = {
+    '1': {'name': 'White', 'hex': '#FFFFFF'},
+    '3': {'name': 'Black', 'hex': '#000000'},
+    '4': {'name': 'Grey', 'hex': '#6b7280'},
+    '9': {'name': 'Navy', 'hex': '#1e3a8a', 'qikink_name': 'Navy Blue'},
+    '10': {'name': 'Red', 'hex': '#dc2626'},
+    '25': {'name': 'Maroon', 'hex': '#7f1d1d'},
+    '41': {'name': 'Olive Green', 'hex': '#6b7c3e'},
+    '43': {'name': 'Yellow', 'hex': '#eab308'},
+    '45': {'name': 'Pink', 'hex': '#ec4899'},
+    '49': {'name': 'Lavender', 'hex': '#c4b5fd'},
+    '52': {'name': 'Coral', 'hex': '#ff7f7f'},
+    '53': {'name': 'Mint', 'hex': '#98d8c8'},
+    '54': {'name': 'Baby Blue', 'hex': '#a7c7e7'},
+}
+
+# Not every Python version knows these image types
+mimetypes.add_type('image/webp', '.webp')
+mimetypes.add_type('image/avif', '.avif')
+
+# In-memory index of remote objects: folder -> {filename: metadata}, and of their sub-folders: folder -> {name}
+_storage_index = {}
+_storage_subfolders = {}
+_storage_index_lock = threading.Lock()
+
+class AdaptiveLimiter:
+    """Cap on in-flight requests that adapts to rate limiting
+
+    The limit is halved whenever a request is rate limited (429) and grows
+    back by one after `limit` successful requests, up to `max_limit`.
+    """
+
+    def __init__(self, max_limit):
+        self.max_limit = max(1, max_limit)
+        self.limit = self.max_limit
+        self.active = 0
+        self.successes = 0
+        self.condition = threading.Condition()
+
+    def __enter__(self):
+        with self.condition:
+            while self.active >= self.limit:
+                self.condition.wait()
+            self.active += 1
+
+    def __exit__(self, *exc_info):
+        with self.condition:
+            self.active -= 1
+            self.condition.notify_all()
+
+    def on_success(self):
+        with self.condition:
+            if self.limit < self.max_limit:
+                self.successes += 1
+                if self.successes >= self.limit:
+                    self.limit += 1
+                    self.successes = 0
+                    self.condition.notify_all()
+
+    def on_throttle(self):
+        with self.condition:
+            if self.limit > 1:
+                self.limit = max(1, self.limit // 2)
+                print(f"   [!]  Rate limited, reducing concurrency to {self.limit}")
+            self.successes = 0
+
+# Global cap on in-flight storage/database requests (see set_request_limit)
+_request_limiter = AdaptiveLimiter(DEFAULT_UPLOAD_JOBS)
+
+class Metrics:
+    """Time, call count and bytes per phase of a command (thread-safe)
+
+    Request phases add up the duration of every request, so with parallel
+    requests a phase can take longer than the command's wall time.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.retries = 0
+        self.products = []
+
+    def record(self, phase, seconds, nbytes=0):
+        with self.lock:
+            stats = self.phases.setdefault(phase, {'calls': 0, 'seconds': 0.0, 'bytes': 0})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['bytes'] += nbytes
+
+    @contextmanager
+    def timed(self, phase, nbytes=0):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - started, nbytes)
+
+# Metrics of the running command (see print_metrics / write_metrics_report)
+_metrics = Metrics()
+
+# Journal of the running sync-config (None outside of it)
+_sync_journal = None
+
+# Process pool shared by every product's image optimization (created on first use)
+_image_pool = None
+_image_pool_lock = threading.Lock()
+
+# HTTP client for resumable uploads (created on first use, shared by all threads)
+_tus_client = None
+_tus_client_lock = threading.Lock()
+
+# Parsed mockup folders (see get_mockup_folder), loaded from MOCKUP_INDEX_PATH on first use
+_mockup_index = None
+_mockup_index_dirty = False
+_mockup_index_lock = threading.Lock()
+
+# Guards the sync --plan totals, which product worker threads add to concurrently
+_plan_lock = threading.Lock()
+
+# Local SQLite copy of products/categories for read commands (see get_catalog_cache).
+# --no-cache turns it off, --refresh rebuilds it from scratch.
+_catalog_cache = None
+_catalog_cache_enabled = True
+_catalog_cache_rebuild = False
+
+def set_request_limit(limit):
+    """Allow at most `limit` storage/database requests in flight at once"""
+    global _request_limiter
+    _request_limiter = AdaptiveLimiter(limit)
+
+def reset_run_state():
+    """Start a new command: fresh metrics, no remembered storage listings, mockup index or catalog cache"""
+    global _metrics, _mockup_index, _mockup_index_dirty, _catalog_cache
+    _metrics = Metrics()
+    with _storage_index_lock:
+        _storage_index.clear()
+        _storage_subfolders.clear()
+    with _mockup_index_lock:
+        _mockup_index = None
+        _mockup_index_dirty = False
+    if _catalog_cache is not None:
+        _catalog_cache.close()
+        _catalog_cache = None
+
+def error_status(error):
+    """HTTP status code carried by a failed request, if any"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None) or getattr(error, 'status_code', None)
+    if status is None and error.args and isinstance(error.args[0], dict):
+        details = error.args[0]
+        status = details.get('statusCode') or details.get('status') or details.get('code')
+    try:
+        return int(status)
+    except (TypeError, ValueError):
+        return None
+
+def is_retryable(error, status, idempotent=True):
+    """Whether a failed request is worth retrying
+
+    Non-idempotent requests are only retried when the server cannot have
+    applied them (rate limited, or the connection was never made).
+    """
+    import httpx
+
+    if status == 429 or isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+        return True
+    if not idempotent:
+        return False
+    return status in RETRYABLE_STATUS or isinstance(error, (httpx.TransportError, ConnectionError, TimeoutError))
 
-# Initialize Supabase client (OFFICIAL SDK)
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+def retry_delay(error, attempt):
+    """Seconds to wait before retry number `attempt` (honours Retry-After)"""
+    response = getattr(error, 'response', None)
+    retry_after = getattr(response, 'headers', {}).get('retry-after') if response is not None else None
+    try:
+        return min(RETRY_MAX_DELAY, float(retry_after))
+    except (TypeError, ValueError):
+        return random.uniform(0, min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt))
+
+def run_request(fn, *args, idempotent=True, phase='request', nbytes=0, **kwargs):
+    """Call a storage/database request under the request limit, retrying transient failures
+
+    Rate limits (429), server errors (5xx) and network errors are retried up to
+    REQUEST_RETRIES times with jittered exponential backoff; rate limits also
+    lower the number of requests allowed in flight. Other errors are raised
+    immediately.
+
+    Each attempt is timed under `phase` (with `nbytes` sent) in the command metrics.
+    """
+    for attempt in range(REQUEST_RETRIES + 1):
+        limiter = _request_limiter
+        with limiter:
+            started = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                error = e
+            else:
+                _metrics.record(phase, time.perf_counter() - started, nbytes)
+                limiter.on_success()
+                return result
+            _metrics.record(phase, time.perf_counter() - started)
+
+        status = error_status(error)
+        if status == 429:
+            limiter.on_throttle()
+        if attempt == REQUEST_RETRIES or not is_retryable(error, status, idempotent):
+            raise error
+
+        delay = retry_delay(error, attempt)
+        with _metrics.lock:
+            _metrics.retries += 1
+        print(f"   [RETRY] Request failed ({status or type(error).__name__}), retrying in {delay:.1f}s...")
+        time.sleep(delay)
+
+def execute(query, idempotent=True, phase='db'):
+    """Execute a query builder under the request limit, with retries"""
+    return run_request(query.execute, idempotent=idempotent, phase=phase)
+
+class GroupedOutput:
+    """sys.stdout wrapper that prints each worker's output as one block
+
+    Inside group(), everything the current thread prints is buffered and
+    written at once when the block ends, so concurrent products don't
+    interleave their lines.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.local = threading.local()
+        self.lock = threading.Lock()
+
+    def write(self, text):
+        buffer = getattr(self.local, 'buffer', None)
+        if buffer is not None:
+            buffer.append(text)
+            return len(text)
+        with self.lock:
+            return self.stream.write(text)
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+    @contextmanager
+    def group(self):
+        self.local.buffer = []
+        try:
+            yield
+        finally:
+            text = ''.join(self.local.buffer)
+            self.local.buffer = None
+            with self.lock:
+                self.stream.write(text)
+                self.stream.flush()
 
 def upload_image(image_path, filename):
-    """Upload image to Supabase Storage using official SDK"""
+    """Upload image to Supabase Storage using official SDK (large files are streamed)"""
     try:
-        with open(image_path, 'rb') as f:
-            # Using official Supabase Python SDK
-            response = supabase.storage.from_("product-images").upload(
-                path=filename,
-                file=f,
-                file_options={"cache-control": "3600", "upsert": True}
-            )
+        upload_mockup_file(image_path, filename)
 
         # Get public URL - returns a string directly
         public_url = supabase.storage.from_("product-images").get_public_url(filename)
@@ -41,7 +434,175 @@ def upload_image(image_path, filename):
         print(f"[X] Error uploading {filename}: {str(e)}")
         return None
 
-def sync_products():
+def upsert_rows(table, rows, on_conflict, batch_size=DEFAULT_BATCH_SIZE, returning='representation'):
+    """Upsert rows in multi-row batches
+
+    A failed batch is split in half and retried until the failing rows are
+    isolated, so one bad row does not take the rest of its batch down with it.
+    Returns (synced_rows, failures) where failures is a list of (row, error);
+    with returning='minimal' the server sends no rows back and synced_rows is empty.
+    """
+    synced = []
+    failures = []
+
+    def send(chunk):
+        try:
+            response = execute(supabase.table(table).upsert(chunk, on_conflict=on_conflict, returning=returning),
+                               phase='db_write')
+            synced.extend(response.data or [])
+        except Exception as e:
+            if len(chunk) == 1:
+                failures.append((chunk[0], e))
+                return
+            middle = len(chunk) // 2
+            send(chunk[:middle])
+            send(chunk[middle:])
+
+    for start in range(0, len(rows), max(1, batch_size)):
+        send(rows[start:start + batch_size])
+
+    return synced, failures
+
+def iter_table(table, columns='*', key='id', page_size=DB_PAGE_SIZE, filters=None):
+    """Yield every row of a table page by page
+
+    Uses keyset pagination on `key` (which must be one of the selected
+    columns), so memory stays constant and pages stay fast on large tables.
+    `filters` is an optional function applied to each page query.
+    """
+    last_key = None
+    while True:
+        query = supabase.table(table).select(columns).order(key).limit(page_size)
+        if filters:
+            query = filters(query)
+        if last_key is not None:
+            query = query.gt(key, last_key)
+
+        rows = execute(query, phase='db_read').data or []
+        yield from rows
+
+        if len(rows) < page_size:
+            return
+        last_key = rows[-1][key]
+
+def fetch_catalog_fingerprints():
+    """{table: (row count, MD5 of the sorted IDs)} from catalog_id_fingerprint(), or None without the function"""
+    try:
+        data = execute(supabase.rpc('catalog_id_fingerprint', {}), phase='db_read').data or {}
+    except Exception as e:
+        if not is_missing_function(e):
+            raise
+        return None
+    return {table: (values['count'], values['md5']) for table, values in data.items()}
+
+def refresh_catalog_cache(cache, log=None):
+    """Bring the local catalog cache up to date with the database
+
+    Only rows with updated_at at or after the newest cached one are fetched.
+    When the cache's ID fingerprint differs from catalog_id_fingerprint()
+    (one request for both tables), an ID-only scan finds the rows deleted
+    remotely, which are pruned, and rows inserted with an older updated_at
+    (e.g. restored by import), which are fetched by ID. Without that
+    function the IDs are always scanned. A cache refreshed within
+    CATALOG_CACHE_MAX_AGE seconds is left as is.
+    """
+    if cache.refreshed_within(CATALOG_CACHE_MAX_AGE):
+        return
+
+    fingerprints = fetch_catalog_fingerprints()
+    for table in ('categories', 'products'):
+        since = cache.high_water(table)
+        # gte, not gt: rows sharing the newest timestamp may not all have been seen yet
+        changed = cache.store(table, iter_table(table, '*', filters=(lambda query: query.gte('updated_at', since)) if since else None))
+
+        removed = set()
+        if fingerprints is None or fingerprints.get(table) != cache.fingerprint(table):
+            remote_ids = {row['id'] for row in iter_table(table, 'id')}
+            cached_ids = cache.ids(table)
+            removed = cached_ids - remote_ids
+            cache.remove(table, removed)
+
+            # Rows the updated_at delta can't see: inserted with a timestamp older than the high-water mark
+            missing = sorted(remote_ids - cached_ids)
+            for start in range(0, len(missing), SKU_FILTER_CHUNK_SIZE):
+                chunk = missing[start:start + SKU_FILTER_CHUNK_SIZE]
+                changed += cache.store(table, iter_table(table, '*', filters=lambda query, chunk=chunk: query.in_('id', chunk)))
+
+        if changed or removed:
+            print(f"[CACHE] {table}: {changed} changed, {len(removed)} removed", file=log)
+    cache.mark_refreshed()
+
+def mark_catalog_cache_stale():
+    """Make the next command refresh the catalog cache, after this one may have written to the database"""
+    if _catalog_cache is not None:
+        _catalog_cache.mark_stale()
+        return
+    from catalog_cache import CACHE_PATH, CatalogCache
+    if CACHE_PATH.exists():
+        cache = CatalogCache()
+        cache.mark_stale()
+        cache.close()
+
+def get_catalog_cache(log=None):
+    """The local catalog cache, refreshed once per run, or None if disabled or unavailable
+
+    Callers fall back to querying the database when this returns None.
+    """
+    global _catalog_cache, _catalog_cache_enabled
+    if not _catalog_cache_enabled:
+        return None
+    if _catalog_cache is not None:
+        return _catalog_cache
+
+    try:
+        from catalog_cache import CatalogCache
+        cache = CatalogCache()
+        if _catalog_cache_rebuild:
+            cache.clear()
+        with _metrics.timed('cache_refresh'):
+            refresh_catalog_cache(cache, log)
+    except Exception as e:
+        print(f"[!]  Catalog cache unavailable ({e}), querying the database directly", file=log)
+        _catalog_cache_enabled = False
+        return None
+
+    _catalog_cache = cache
+    return cache
+
+def fetch_category_ids(slugs):
+    """Resolve category IDs for many slugs with a single query"""
+    response = execute(supabase.table('categories').select('id, slug').in_('slug', list(slugs)), phase='db_read')
+    return {row['slug']: row['id'] for row in response.data or []}
+
+def ensure_categories(category_rows, batch_size=DEFAULT_BATCH_SIZE):
+    """Create or update categories in bulk and return {slug: id}"""
+    print(f"[CAT] Syncing {len(category_rows)} category(ies)...")
+
+    try:
+        existing_ids = fetch_category_ids(row['slug'] for row in category_rows)
+    except Exception as e:
+        print(f"   [!] Category error: {e}")
+        return {}
+
+    synced, failures = upsert_rows('categories', category_rows, 'slug', batch_size)
+    category_ids = {row['slug']: row['id'] for row in synced}
+
+    for row, error in failures:
+        print(f"   [!] Category error ({row['slug']}): {error}")
+
+    for row in category_rows:
+        slug = row['slug']
+        if slug not in category_ids:
+            continue
+        status = f" (is_active={row['is_active']})" if 'is_active' in row else ''
+        if slug in existing_ids:
+            print(f"   [UPD] Updated category {slug}{status}")
+        else:
+            print(f"   [+] Created category {slug}{status}")
+
+    return category_ids
+
+def sync_products(batch_size=DEFAULT_BATCH_SIZE):
     """Sync products from products.json to Supabase"""
     print("[RUN] Starting product sync...")
 
@@ -55,28 +616,26 @@ def sync_products():
         print(f"[DIR] Please create an 'images' folder and add your product images")
         return
 
+    # Insert or update all categories in one batch
+    category_ids = ensure_categories([
+        {
+            'name': category_data['name'],
+            'slug': category_data['slug'],
+            'description': category_data['description']
+        }
+        for category_data in products_data['categories']
+    ], batch_size)
+
+    # Product payloads collected for the batched upsert
+    product_payloads = []
+
     # Process categories
     for category_data in products_data['categories']:
         print(f"[CAT] Processing category: {category_data['name']}")
 
-        # Insert or update category using official SDK
-        try:
-            response = supabase.table('categories').upsert({
-                'name': category_data['name'],
-                'slug': category_data['slug'],
-                'description': category_data['description']
-            }, on_conflict='slug').execute()
-
-            # Get category ID
-            category_response = supabase.table('categories').select('id').eq('slug', category_data['slug']).execute()
-            category_id = category_response.data[0]['id'] if category_response.data else None
-
-            if not category_id:
-                print(f"[X] Could not get category ID for {category_data['name']}")
-                continue
-
-        except Exception as e:
-            print(f"[X] Error with category {category_data['name']}: {str(e)}")
+        category_id = category_ids.get(category_data['slug'])
+        if not category_id:
+            print(f"[X] Could not get category ID for {category_data['name']}")
             continue
 
         # Process products in this category
@@ -98,57 +657,232 @@ def sync_products():
                 else:
                     print(f"[!]  Image not found: {image_path}")
 
-            # Insert or update product using official SDK
-            try:
-                product_payload = {
-                    'name': product_data['name'],
-                    'description': product_data['description'],
-                    'price': product_data['price'],
-                    'compare_at_price': product_data.get('compare_at_price'),
-                    'sku': product_data['sku'],
-                    'category_id': category_id,
-                    'images': [image_url] if image_url else [],
-                    'is_active': product_data['active'],
-                    'vendor': product_data.get('vendor'),
-                    'product_type': product_data.get('product_type'),
-                    'material': product_data.get('material'),
-                    'variants': product_data.get('variants', {}),  # Keep as dict, Supabase handles JSON
-                    'tags': product_data.get('tags', [])
-                }
-
-                response = supabase.table('products').upsert(product_payload, on_conflict='sku').execute()
-                print(f"[OK] Product synced: {product_data['name']}")
+            product_payloads.append({
+                'name': product_data['name'],
+                'description': product_data['description'],
+                'price': product_data['price'],
+                'compare_at_price': product_data.get('compare_at_price'),
+                'sku': product_data['sku'],
+                'category_id': category_id,
+                'images': [image_url] if image_url else [],
+                'is_active': product_data['active'],
+                'vendor': product_data.get('vendor'),
+                'product_type': product_data.get('product_type'),
+                'material': product_data.get('material'),
+                'variants': product_data.get('variants', {}),  # Keep as dict, Supabase handles JSON
+                'tags': product_data.get('tags', [])
+            })
 
-            except Exception as e:
-                print(f"[X] Error with product {product_data['name']}: {str(e)}")
+    # Insert or update products in multi-row batches
+    if product_payloads:
+        synced, failures = upsert_rows('products', product_payloads, 'sku', batch_size)
+        for product_payload, error in failures:
+            print(f"[X] Error with product {product_payload['name']}: {error}")
+        print(f"[OK] {len(synced)} product(s) synced")
 
     print("[DONE] Product sync completed!")
 
-def clean_products():
-    """Remove products not in products.json"""
-    print("[DEL]  Removing inactive products...")
+def comparable_qikink_row(row):
+    """Normalize a qikink_products row so CSV rows and database rows compare equal"""
+    metadata = row.get('metadata') or {}
+    return (
+        row.get('product_type'),
+        row.get('gender'),
+        row.get('style_code'),
+        row.get('color_code'),
+        row.get('color_name'),
+        row.get('size'),
+        float(row.get('base_price') or 0),
+        float(metadata.get('shipping_weight') or 0),
+        float(metadata.get('tax_rate') or 0),
+        metadata.get('description')
+    )
+
+def import_qikink_skus(csv_path='Qikink_skus.csv', batch_size=QIKINK_IMPORT_BATCH_SIZE, dry_run=False):
+    """Load Qikink_skus.csv into qikink_products, writing only new or changed rows"""
+    from qikink_sku_index import QikinkSku, read_csv, to_db_row
+
+    print(f"[RUN] Importing Qikink SKUs from {csv_path}...")
+
+    if not Path(csv_path).exists():
+        print(f"[X] CSV file not found: {csv_path}")
+        return False
 
-    with open('products.json', 'r') as f:
-        products_data = json.load(f)
+    # Fetch the current table once
+    try:
+        existing = {
+            row['qikink_sku']: comparable_qikink_row(row)
+            for row in iter_table(
+                'qikink_products',
+                'id, qikink_sku, product_type, gender, style_code, color_code, color_name, size, base_price, metadata'
+            )
+        }
+    except Exception as e:
+        print(f"[X] Error fetching qikink_products: {e}")
+        return False
+    print(f"   [DB] {len(existing)} SKU(s) currently in qikink_products")
 
-    # Collect active SKUs
-    active_skus = []
-    for category in products_data['categories']:
-        for product in category['products']:
-            if product['active']:
-                active_skus.append(product['sku'])
+    # Stream the CSV and diff it against the table
+    inserts = {}
+    updates = {}
+    unchanged = 0
+    parse_errors = []
 
-    # Deactivate products not in active list
-    for sku in active_skus:
-        # This is a simplified version - you'd need to implement proper filtering
-        pass
+    for line_number, item in read_csv(csv_path):
+        if not isinstance(item, QikinkSku):
+            parse_errors.append((line_number, item))
+            continue
 
-    print("[OK] Inactive products cleaned up")
+        row = to_db_row(item)
+        sku = row['qikink_sku']
+        if sku not in existing:
+            inserts[sku] = row
+        elif existing[sku] != comparable_qikink_row(row):
+            updates[sku] = row
+        else:
+            unchanged += 1
+
+    for line_number, error in parse_errors:
+        print(f"   [!] Row {line_number}: {error}")
+
+    print(f"   [+] New: {len(inserts)}")
+    print(f"   [UPD] Changed: {len(updates)}")
+    print(f"   [SKIP] Unchanged: {unchanged}")
+
+    changed_rows = list(inserts.values()) + list(updates.values())
+    if dry_run or not changed_rows:
+        print("[DONE] Nothing written" + (" (dry run)" if dry_run and changed_rows else ""))
+        return True
+
+    synced, failures = upsert_rows('qikink_products', changed_rows, 'qikink_sku', batch_size)
+    for row, error in failures:
+        print(f"   [X] Error importing {row['qikink_sku']}: {error}")
+
+    print(f"[DONE] Imported {len(synced)} SKU(s), {len(failures)} failed")
+    return not failures
+
+def configured_skus(path):
+    """(active SKUs, all listed SKUs) of products-config.json or a legacy products.json
+
+    In products-config.json a product is active unless it or its category
+    sets active: false; products.json lists its categories as an array.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+
+    active = set()
+    listed = set()
+    categories = data.get('categories', {})
+    if isinstance(categories, dict):
+        for category_data in categories.values():
+            defaults = category_data.get('defaults', {})
+            for product in category_data.get('products', []):
+                listed.add(product['sku'])
+                if category_data.get('active', True) and {**defaults, **product}.get('active', True):
+                    active.add(product['sku'])
+    else:
+        for category_data in categories:
+            for product in category_data['products']:
+                listed.add(product['sku'])
+                if product.get('active'):
+                    active.add(product['sku'])
+    return active, listed
+
+def is_missing_function(error):
+    """Whether a failed rpc() call means the database function does not exist"""
+    details = error.args[0] if error.args and isinstance(error.args[0], dict) else {}
+    return (getattr(error, 'code', None) or details.get('code')) in ('PGRST202', '42883')
+
+def remove_products_not_in(keep_skus, rows, delete=False):
+    """Deactivate (or delete) every product with a SKU outside keep_skus
+
+    Runs as one statement through the clean_products_not_in() function from
+    migrations/consolidated_schema.sql. Databases without the function fall
+    back to batched requests on the locally computed rows.
+    Returns the number of products changed.
+    """
+    try:
+        response = execute(supabase.rpc('clean_products_not_in', {
+            'keep_skus': sorted(keep_skus),
+            'delete_rows': delete
+        }))
+        return response.data or 0
+    except Exception as e:
+        if not is_missing_function(e):
+            raise
+        print("[!]  clean_products_not_in() not found (run migrations/consolidated_schema.sql), "
+              f"updating products {SKU_FILTER_CHUNK_SIZE} at a time")
+
+    ids = [row['id'] for row in rows]
+    changed = 0
+    for start in range(0, len(ids), SKU_FILTER_CHUNK_SIZE):
+        query = supabase.table('products')
+        query = query.delete(count='exact', returning='minimal') if delete else \
+            query.update({'is_active': False}, count='exact', returning='minimal')
+        changed += execute(query.in_('id', ids[start:start + SKU_FILTER_CHUNK_SIZE])).count or 0
+    return changed
+
+def clean_products(path=None, delete=False, dry_run=False):
+    """Deactivate products that are not active in the config (or products.json)
+
+    The SKUs to keep come from products-config.json, or products.json when
+    there is no config (or from `path`). Products without a SKU (e.g. added
+    with `append`) are never touched. With delete=True products missing from
+    the file altogether are deleted instead; ones listed as inactive are
+    still only deactivated.
+    """
+    if path is None:
+        path = 'products-config.json' if Path('products-config.json').exists() else 'products.json'
+    print(f"[DEL]  Removing products not active in {path}...")
+
+    try:
+        active_skus, listed_skus = configured_skus(path)
+    except (OSError, ValueError, KeyError) as e:
+        print(f"[X] Could not read {path}: {e}")
+        return False
+
+    if not active_skus:
+        print(f"[X] No active products in {path}, refusing to deactivate the whole catalog")
+        return False
+
+    try:
+        cache = get_catalog_cache()
+        rows = cache.products() if cache else iter_table('products', 'id, sku, is_active')
+        stale = [row for row in rows if row.get('sku') and row['sku'] not in active_skus]
+        to_delete = [row for row in stale if row['sku'] not in listed_skus] if delete else []
+        delete_ids = {row['id'] for row in to_delete}
+        to_deactivate = [row for row in stale if row.get('is_active') and row['id'] not in delete_ids]
+
+        if not to_delete and not to_deactivate:
+            print("[OK] Nothing to clean up")
+            return True
+
+        if dry_run:
+            for label, group in (('deactivate', to_deactivate), ('delete', to_delete)):
+                if group:
+                    skus = sorted(row['sku'] for row in group)
+                    more = f" (+{len(skus) - 20} more)" if len(skus) > 20 else ''
+                    print(f"[DRY RUN] Would {label} {len(skus)} product(s): {', '.join(skus[:20])}{more}")
+            return True
+
+        if to_delete:
+            deleted = remove_products_not_in(listed_skus, to_delete, delete=True)
+            print(f"[OK] Deleted {deleted} product(s) missing from {path}")
+        if to_deactivate:
+            deactivated = remove_products_not_in(active_skus, to_deactivate)
+            print(f"[OK] Deactivated {deactivated} product(s) not active in {path}")
+        return True
+
+    except Exception as e:
+        print(f"[X] Error cleaning up products: {e}")
+        return False
+
+# Pattern: Front_1_c_1.jpg or Back_2_c_10.jpg
+MOCKUP_FILENAME_PATTERN = re.compile(r'^(\w+)_(\d+)_c_(\d+)\.(jpg|png)$', re.IGNORECASE)
 
 def parse_mockup_filename(filename):
     """Parse mockup filename to extract view, view number, and color ID"""
-    # Pattern: Front_1_c_1.jpg or Back_2_c_10.jpg
-    match = re.match(r'^(\w+)_(\d+)_c_(\d+)\.(jpg|png)$', filename, re.IGNORECASE)
+    match = MOCKUP_FILENAME_PATTERN.match(filename)
 
     if not match:
         return None
@@ -161,110 +895,550 @@ def parse_mockup_filename(filename):
         'filename': filename
     }
 
-def group_mockups_by_color(mockup_dir):
-    """Group mockup files by color ID and include size chart"""
-    files = os.listdir(mockup_dir)
-    color_groups = {}
-    size_chart = None
+def classify_mockup_files(filenames):
+    """Sort a mockup folder's filenames into default image, size chart and parsed mockups
 
-    for filename in files:
-        # Skip default.jpg and zip files
-        if filename == 'default.jpg' or filename.endswith('.zip'):
-            continue
+    Returns {'files': [...], 'default': name, 'size_chart': name,
+    'mockups': {filename: [view, view_number, color_id]}}. Zip files,
+    hidden files and names without an extension are left out.
+    """
+    folder = {'files': [], 'default': None, 'size_chart': None, 'mockups': {}}
 
-        # Capture size_chart file
-        if 'size_chart' in filename.lower():
-            size_chart = filename
+    for filename in sorted(filenames):
+        if filename.startswith('.') or '.' not in filename or filename.endswith('.zip'):
             continue
+        folder['files'].append(filename)
 
-        metadata = parse_mockup_filename(filename)
-        if metadata:
-            color_id = metadata['color_id']
-            if color_id not in color_groups:
-                color_groups[color_id] = []
-
-            # Build the URL for this mockup
-            folder_name = os.path.basename(mockup_dir)
-            url = f"/mockups/{folder_name}/{filename}"
-            color_groups[color_id].append({
-                'url': url,
-                'view': metadata['view'],
-                'view_number': metadata['view_number']
-            })
+        if filename.lower() == 'default.jpg':
+            folder['default'] = filename
+        elif 'size_chart' in filename.lower():
+            folder['size_chart'] = filename
+        else:
+            metadata = parse_mockup_filename(filename)
+            if metadata:
+                folder['mockups'][filename] = [metadata['view'], metadata['view_number'], metadata['color_id']]
 
-    # Sort images within each color group (Front first, then Back)
-    for color_id in color_groups:
-        color_groups[color_id].sort(key=lambda x: (
-            0 if x['view'].lower() == 'front' else 1 if x['view'].lower() == 'back' else 2,
-            x['view_number']
-        ))
+    return folder
 
-        # Add size chart at the end if it exists
+def scan_mockup_folder(mockup_dir):
+    """Classify the files of one mockup folder in a single os.scandir pass"""
+    with os.scandir(mockup_dir) as entries:
+        return classify_mockup_files([entry.name for entry in entries if entry.is_file()])
+
+def load_mockup_index():
+    """Scanned mockup folders from .sync-cache/, keyed by folder path"""
+    try:
+        with open(MOCKUP_INDEX_PATH, 'r') as f:
+            index = json.load(f)
+        if index.get('version') == MOCKUP_INDEX_VERSION:
+            return index['folders']
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
+    return {}
+
+def save_mockup_index():
+    """Write the mockup index back to .sync-cache/ if any folder was rescanned"""
+    global _mockup_index_dirty
+    with _mockup_index_lock:
+        if not _mockup_index_dirty:
+            return
+        MOCKUP_INDEX_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = MOCKUP_INDEX_PATH.with_name(MOCKUP_INDEX_PATH.name + '.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump({'version': MOCKUP_INDEX_VERSION, 'folders': _mockup_index}, f)
+        os.replace(tmp_path, MOCKUP_INDEX_PATH)
+        _mockup_index_dirty = False
+
+def get_mockup_folder(mockup_dir):
+    """Index entry (see scan_mockup_folder) for a mockup folder
+
+    The folder is only rescanned when its mtime changed, i.e. when files
+    were added, removed or renamed since the last scan.
+    """
+    global _mockup_index, _mockup_index_dirty
+    key = os.path.normpath(mockup_dir)
+    mtime_ns = os.stat(mockup_dir).st_mtime_ns
+
+    with _mockup_index_lock:
+        if _mockup_index is None:
+            _mockup_index = load_mockup_index()
+        folder = _mockup_index.get(key)
+        if folder and folder['mtime_ns'] == mtime_ns:
+            return folder
+
+    with _metrics.timed('scan'):
+        folder = scan_mockup_folder(mockup_dir)
+    folder['mtime_ns'] = mtime_ns
+
+    with _mockup_index_lock:
+        _mockup_index[key] = folder
+        _mockup_index_dirty = True
+    return folder
+
+def scan_mockups(root='mockups'):
+    """Bring the mockup index up to date for every folder under root
+
+    Unchanged folders cost one stat each; folders that no longer exist are
+    dropped from the index. Returns {folder name: index entry}.
+    """
+    global _mockup_index_dirty
+    folders = {}
+    try:
+        with os.scandir(root) as entries:
+            subdirs = sorted(entry.path for entry in entries if entry.is_dir())
+    except OSError:
+        return folders
+
+    for path in subdirs:
+        folders[os.path.basename(path)] = get_mockup_folder(path)
+
+    root_key = os.path.normpath(root)
+    current = {os.path.normpath(path) for path in subdirs}
+    with _mockup_index_lock:
+        stale = [key for key in _mockup_index if os.path.dirname(key) == root_key and key not in current]
+        for key in stale:
+            del _mockup_index[key]
+        _mockup_index_dirty = _mockup_index_dirty or bool(stale)
+
+    return folders
+
+def view_sort_key(image):
+    """Front views first, then Back, then the rest, each by view number"""
+    view = image['view'].lower()
+    return (0 if view == 'front' else 1 if view == 'back' else 2, image['view_number'])
+
+def group_images_by_color(images, size_chart=None):
+    """Group image dicts (url, view, view_number, color_id) by color ID
+
+    Each group is ordered with view_sort_key and, if given, ends with the
+    size_chart image dict.
+    """
+    color_groups = {}
+    for image in images:
+        color_groups.setdefault(image['color_id'], []).append(image)
+
+    for images_of_color in color_groups.values():
+        images_of_color.sort(key=view_sort_key)
         if size_chart:
-            folder_name = os.path.basename(mockup_dir)
-            color_groups[color_id].append({
-                'url': f"/mockups/{folder_name}/{size_chart}",
-                'view': 'SizeChart',
-                'view_number': 999
-            })
+            images_of_color.append(dict(size_chart))
 
     return color_groups
 
-def upload_mockups_to_storage(mockup_dir, product_slug, skip_existing=True):
-    """Upload mockup files to Supabase Storage and return URLs"""
-    print(f"[UP] Checking mockups in Supabase Storage...")
+def group_mockups_by_color(mockup_dir):
+    """Group mockup files by color ID and include size chart"""
+    folder = get_mockup_folder(mockup_dir)
+    folder_name = os.path.basename(os.path.normpath(mockup_dir))
 
-    mockup_path = Path(mockup_dir)
-    files = list(mockup_path.glob('*.*'))
-    uploaded_urls = []
-    skipped_count = 0
+    images = [
+        {'url': f"/mockups/{folder_name}/{filename}", 'view': view, 'view_number': view_number, 'color_id': color_id}
+        for filename, (view, view_number, color_id) in folder['mockups'].items()
+    ]
+    size_chart = None
+    if folder['size_chart']:
+        size_chart = {'url': f"/mockups/{folder_name}/{folder['size_chart']}", 'view': 'SizeChart', 'view_number': 999}
+
+    return group_images_by_color(images, size_chart)
+
+def list_storage_folder(folder):
+    """List every file in a storage folder, following pagination"""
+    entries = []
+    offset = 0
+    while True:
+        page = run_request(supabase.storage.from_("product-images").list, folder, {
+            'limit': STORAGE_LIST_PAGE_SIZE,
+            'offset': offset,
+            'sortBy': {'column': 'name', 'order': 'asc'}
+        }, phase='storage_list')
+        entries.extend(page or [])
+        if not page or len(page) < STORAGE_LIST_PAGE_SIZE:
+            return entries
+        offset += STORAGE_LIST_PAGE_SIZE
+
+def get_remote_files(folder):
+    """Return {filename: metadata} for a storage folder, listing it only once per run"""
+    with _storage_index_lock:
+        if folder in _storage_index:
+            return _storage_index[folder]
+
+    try:
+        entries = list_storage_folder(folder)
+    except Exception as e:
+        print(f"   [!]  Could not list storage folder {folder}: {e}")
+        return {}
+
+    # Sub-folders come back without an id; only index actual files
+    files = {entry['name']: entry.get('metadata') or {} for entry in entries if entry.get('id')}
+    with _storage_index_lock:
+        _storage_subfolders.setdefault(folder, {entry['name'] for entry in entries if not entry.get('id')})
+        return _storage_index.setdefault(folder, files)
+
+def remote_file_exists(storage_path):
+    """Whether an object exists, listing its parent folder only if that folder exists
+
+    Used for content-addressed paths: one listing of cas/ shows which of the
+    256 cas/<ab>/ prefixes exist, so missing ones are never listed.
+    """
+    folder, filename = storage_path.rsplit('/', 1)
+    parent, _, name = folder.rpartition('/')
+    with _storage_index_lock:
+        known = folder in _storage_index
+    if not known:
+        get_remote_files(parent)
+        with _storage_index_lock:
+            if name not in _storage_subfolders.get(parent, ()):
+                return False
+    return filename in get_remote_files(folder)
 
-    for file_path in files:
-        filename = file_path.name
+def mark_remote_file(folder, filename, metadata=None):
+    """Record a successful upload in the in-memory storage index"""
+    with _storage_index_lock:
+        _storage_index.setdefault(folder, {})[filename] = metadata or {}
 
-        # Skip zip files
-        if filename.endswith('.zip'):
-            continue
+def new_sync_state():
+    """Empty sync manifest
+
+    files:    storage path (or local path for content-addressed uploads) -> sha256/size/mtime
+    objects:  sha256 -> public URL of the content-addressed copy
+    uploads:  storage path -> unfinished resumable upload (url, size, mtime)
+    """
+    return {'version': SYNC_STATE_VERSION, 'files': {}, 'objects': {}, 'uploads': {}}
+
+def load_sync_state():
+    """Load the sync manifest, or start an empty one"""
+    empty = new_sync_state()
+    if not SYNC_STATE_PATH.exists():
+        return empty
+
+    try:
+        with open(SYNC_STATE_PATH, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError) as e:
+        print(f"[!]  Ignoring unreadable {SYNC_STATE_PATH}: {e}")
+        return empty
+
+    if state.get('version') != SYNC_STATE_VERSION:
+        return empty
+    return {key: state.get(key, value) for key, value in empty.items()}
+
+def save_sync_state(state):
+    """Write the sync manifest atomically"""
+    tmp_path = SYNC_STATE_PATH.with_name(SYNC_STATE_PATH.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, SYNC_STATE_PATH)
+
+class SyncJournal:
+    """Append-only log of completed sync steps, one JSON object per line
+
+    Each entry is flushed and fsynced before the step counts as done, so even
+    a killed process leaves a journal that --resume can replay.
+    """
+
+    def __init__(self, path=SYNC_JOURNAL_PATH):
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.file = open(self.path, 'a')
+
+    def record(self, step, **fields):
+        line = json.dumps({'step': step, **fields}, sort_keys=True)
+        with self.lock:
+            self.file.write(line + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+
+    def close(self, completed=False):
+        """Close the journal, deleting it once the run has finished"""
+        with self.lock:
+            self.file.close()
+        if completed:
+            self.path.unlink(missing_ok=True)
+
+def read_sync_journal(path=SYNC_JOURNAL_PATH):
+    """Entries of an interrupted run's journal (a torn last line is ignored)"""
+    entries = []
+    try:
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    break
+    except FileNotFoundError:
+        pass
+    return entries
+
+def replay_sync_journal(entries, sync_state):
+    """Apply journaled steps to the manifest
+
+    Returns ({category slug: id}, {sku: product fingerprint}) of the
+    categories and products the interrupted run had already finished.
+    """
+    category_ids = {}
+    done_products = {}
+    for entry in entries:
+        step = entry.get('step')
+        if step == 'category':
+            category_ids[entry['slug']] = entry['id']
+        elif step == 'file':
+            sync_state['files'][entry['path']] = entry['state']
+        elif step == 'object':
+            sync_state['objects'][entry['sha256']] = entry['url']
+        elif step == 'upload':
+            if entry.get('session'):
+                sync_state['uploads'][entry['path']] = entry['session']
+            else:
+                sync_state['uploads'].pop(entry['path'], None)
+        elif step == 'product':
+            done_products[entry['sku']] = entry['fingerprint']
+    return category_ids, done_products
+
+def journal_step(step, **fields):
+    """Record a completed step in the running sync's journal, if any"""
+    if _sync_journal is not None:
+        _sync_journal.record(step, **fields)
+
+def product_fingerprint(product_data, category_id, options):
+    """Hash of everything a product's sync depends on (config, options, mockup files)"""
+    mockup_dir = Path('mockups') / product_data.get('mockup_folder', '')
+    try:
+        files = sorted((entry.name, entry.stat().st_size, entry.stat().st_mtime_ns)
+                       for entry in os.scandir(mockup_dir) if entry.is_file())
+    except OSError:
+        files = []
+    return payload_hash({'product': product_data, 'category_id': category_id, 'options': options, 'files': files})
+
+def file_sha256(file_path):
+    """Hash a file in 1 MB chunks"""
+    digest = hashlib.sha256()
+    with _metrics.timed('hash', os.path.getsize(file_path)):
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def payload_hash(payload):
+    """Stable hash of a product payload"""
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(encoded).hexdigest()
+
+def local_file_state(sync_state, storage_path, file_path):
+    """Return the hash, size and mtime of a local file
+
+    The recorded hash is reused when size and mtime are unchanged, so an
+    unchanged catalog is not re-read from disk on every sync.
+    """
+    stat = file_path.stat()
+    recorded = sync_state['files'].get(storage_path)
+    if recorded and recorded.get('size') == stat.st_size and recorded.get('mtime') == stat.st_mtime:
+        return recorded
+    return {'sha256': file_sha256(file_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+def is_file_synced(sync_state, storage_path, local_state, remote_metadata):
+    """Check whether the remote copy of a file matches the local one"""
+    recorded = sync_state['files'].get(storage_path)
+    if recorded:
+        return recorded['sha256'] == local_state['sha256']
+
+    # Not in the manifest yet (first sync): trust a remote copy of the same size
+    return remote_metadata.get('size') in (None, local_state['size'])
+
+def get_tus_client():
+    """httpx client for the resumable upload endpoint"""
+    global _tus_client
+    with _tus_client_lock:
+        if _tus_client is None:
+            import httpx
+            _tus_client = httpx.Client(timeout=REQUEST_TIMEOUT)
+        return _tus_client
+
+def tus_headers(**extra):
+    """Headers for a TUS request to Supabase Storage"""
+    _, key = supabase_credentials()
+    return {'Authorization': f"Bearer {key}", 'apikey': key, 'Tus-Resumable': '1.0.0', **extra}
+
+def tus_create(storage_path, size, content_type):
+    """Start a resumable upload of `size` bytes and return its URL"""
+    url, _ = supabase_credentials()
+    endpoint = f"{url.rstrip('/')}/storage/v1/upload/resumable"
+    metadata = {
+        'bucketName': 'product-images',
+        'objectName': storage_path,
+        'contentType': content_type,
+        'cacheControl': '3600'
+    }
+
+    def send():
+        response = get_tus_client().post(endpoint, headers=tus_headers(**{
+            'Upload-Length': str(size),
+            'Upload-Metadata': ','.join(f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in metadata.items()),
+            'x-upsert': 'true'
+        }))
+        response.raise_for_status()
+        return str(response.url.join(response.headers['Location']))
+
+    return run_request(send, phase='upload')
+
+def tus_offset(upload_url):
+    """Bytes the server already has for a resumable upload, or None if it expired"""
+    response = get_tus_client().head(upload_url, headers=tus_headers())
+    if response.status_code in (404, 410):
+        return None
+    response.raise_for_status()
+    return int(response.headers['Upload-Offset'])
+
+def tus_send_chunk(upload_url, offset, chunk):
+    """Send one chunk at `offset` and return the server's new offset"""
+    response = get_tus_client().patch(upload_url, content=chunk, headers=tus_headers(**{
+        'Upload-Offset': str(offset),
+        'Content-Type': 'application/offset+octet-stream'
+    }))
+    if response.status_code == 409:
+        # An earlier attempt got (partly) through: carry on from where the server is
+        server_offset = tus_offset(upload_url)
+        if server_offset is None:
+            response.raise_for_status()
+        return server_offset
+    response.raise_for_status()
+    return int(response.headers['Upload-Offset'])
+
+def upload_resumable(file_path, storage_path, content_type, uploads=None):
+    """Upload a large file with the TUS protocol, holding one chunk in memory at a time
+
+    `uploads` is the manifest's table of unfinished uploads: the upload URL is
+    recorded there (and in the journal) so an interrupted run continues from
+    the last chunk the server acknowledged, as long as the file is unchanged.
+    """
+    stat = os.stat(file_path)
+    session = (uploads or {}).get(storage_path)
+    offset = None
+    if session and session.get('size') == stat.st_size and session.get('mtime') == stat.st_mtime:
+        try:
+            offset = run_request(tus_offset, session['url'], phase='upload')
+        except Exception:
+            offset = None
+        if offset is not None:
+            print(f"   [RESUME] {storage_path} from {format_bytes(offset)} of {format_bytes(stat.st_size)}")
+
+    if offset is None:
+        session = {'url': tus_create(storage_path, stat.st_size, content_type), 'size': stat.st_size, 'mtime': stat.st_mtime}
+        offset = 0
+        if uploads is not None:
+            uploads[storage_path] = session
+            journal_step('upload', path=storage_path, session=session)
+
+    with open(file_path, 'rb') as f:
+        while offset < stat.st_size:
+            f.seek(offset)
+            chunk = f.read(RESUMABLE_CHUNK_SIZE)
+            offset = run_request(tus_send_chunk, session['url'], offset, chunk, phase='upload', nbytes=len(chunk))
+
+    if uploads is not None:
+        uploads.pop(storage_path, None)
+        journal_step('upload', path=storage_path, session=None)
+
+def upload_mockup_file(file_path, storage_path, uploads=None):
+    """Upload a single mockup file to Supabase Storage
+
+    Files above RESUMABLE_UPLOAD_THRESHOLD are streamed with upload_resumable;
+    `uploads` is the manifest's table of unfinished resumable uploads.
+    """
+    content_type = mimetypes.guess_type(str(file_path))[0] or 'application/octet-stream'
+    size = os.path.getsize(file_path)
+    if size > RESUMABLE_UPLOAD_THRESHOLD:
+        upload_resumable(file_path, storage_path, content_type, uploads)
+        return
+
+    def send():
+        # Reopen the file on every attempt so retries upload from the start
+        with open(file_path, 'rb') as f:
+            return supabase.storage.from_("product-images").upload(
+                path=storage_path,
+                file=f,
+                file_options={"cache-control": "3600", "content-type": content_type, "upsert": "true"}
+            )
 
-        storage_path = f"{product_slug}/{filename}"
+    run_request(send, phase='upload', nbytes=size)
+
+def get_public_url(storage_path):
+    """Public URL of a storage object (without the SDK's trailing '?')"""
+    public_url = supabase.storage.from_("product-images").get_public_url(storage_path)
+    if public_url.endswith('?'):
+        public_url = public_url[:-1]
+    return public_url
+
+def upload_files(files, folder, skip_existing=True, jobs=DEFAULT_UPLOAD_JOBS, sync_state=None, plan=None):
+    """Upload (local path, filename) pairs into a storage folder and return URLs
+
+    Up to `jobs` files are uploaded concurrently. The returned list keeps the
+    input order regardless of which upload finishes first.
+
+    When a sync manifest is given, files whose content hash changed since the
+    last sync are re-uploaded even if the filename already exists remotely.
+
+    With a `plan` dict nothing is uploaded: files that would be uploaded are
+    added to plan['uploads'] as (storage path, bytes) and all URLs are returned.
+    """
+    results = [None] * len(files)
+    pending = []
+    skipped_count = 0
+
+    # One (paginated) listing per folder instead of one per file
+    remote_files = get_remote_files(folder) if skip_existing else {}
+
+    for index, (file_path, filename) in enumerate(files):
+        storage_path = f"{folder}/{filename}"
 
         # Get public URL
-        public_url = supabase.storage.from_("product-images").get_public_url(storage_path)
-        if public_url.endswith('?'):
-            public_url = public_url[:-1]
+        public_url = get_public_url(storage_path)
 
-        # Check if file already exists in storage
-        file_exists = False
-        if skip_existing:
-            try:
-                # Try to list the file - if it exists, this won't error
-                list_response = supabase.storage.from_("product-images").list(product_slug)
-                if list_response:
-                    file_exists = any(f.get('name') == filename for f in list_response)
-            except:
-                file_exists = False
-
-        if file_exists:
+        local_state = None
+        if sync_state is not None:
+            local_state = local_file_state(sync_state, storage_path, file_path)
+
+        # Check if file already exists in storage (and is unchanged)
+        if filename in remote_files and (
+            local_state is None or is_file_synced(sync_state, storage_path, local_state, remote_files[filename])
+        ):
             # File already exists, just add its URL
-            uploaded_urls.append({
+            results[index] = {
                 'filename': filename,
                 'url': public_url
-            })
+            }
+            if local_state:
+                sync_state['files'][storage_path] = local_state
             skipped_count += 1
         else:
-            # Upload new file
+            pending.append((index, file_path, filename, storage_path, public_url, local_state))
+
+    if plan is not None:
+        sizes = [(storage_path, file_path.stat().st_size) for _, file_path, _, storage_path, _, _ in pending]
+        with _plan_lock:
+            plan['uploads'].extend(sizes)
+        for index, file_path, filename, storage_path, public_url, local_state in pending:
+            results[index] = {'filename': filename, 'url': public_url}
+        if pending:
+            print(f"   [PLAN] {len(pending)} file(s) would be uploaded")
+        pending = []
+
+    # Upload new files, `jobs` at a time
+    uploads = sync_state['uploads'] if sync_state is not None else None
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {
+            executor.submit(upload_mockup_file, file_path, storage_path, uploads): (index, filename, storage_path, public_url, local_state)
+            for index, file_path, filename, storage_path, public_url, local_state in pending
+        }
+        for future in as_completed(futures):
+            index, filename, storage_path, public_url, local_state = futures[future]
             try:
-                with open(file_path, 'rb') as f:
-                    supabase.storage.from_("product-images").upload(
-                        path=storage_path,
-                        file=f,
-                        file_options={"cache-control": "3600", "upsert": "true"}
-                    )
-
-                uploaded_urls.append({
+                future.result()
+                mark_remote_file(folder, filename)
+                if local_state:
+                    sync_state['files'][storage_path] = local_state
+                    journal_step('file', path=storage_path, state=local_state)
+                results[index] = {
                     'filename': filename,
                     'url': public_url
-                })
+                }
                 print(f"   [OK] Uploaded: {filename}")
 
             except Exception as e:
@@ -273,10 +1447,264 @@ def upload_mockups_to_storage(mockup_dir, product_slug, skip_existing=True):
     if skipped_count > 0:
         print(f"   [SKIP] {skipped_count} file(s) already in storage")
 
-    return uploaded_urls
+    return [item for item in results if item]
+
+def content_addressed_path(sha256, file_path):
+    """Storage path of a content-addressed object"""
+    return f"{CONTENT_ADDRESSED_PREFIX}/{sha256[:2]}/{sha256}{Path(file_path).suffix.lower()}"
+
+def upload_files_deduplicated(files, jobs=DEFAULT_UPLOAD_JOBS, sync_state=None, plan=None):
+    """Upload (local path, filename) pairs to content-addressed paths and return URLs
+
+    Identical bytes map to the same object, so a size chart or mockup shared
+    by many products is uploaded once. Known hashes are resolved from the
+    manifest's hash -> URL index without touching storage at all.
+    With a `plan` dict nothing is uploaded (see upload_files).
+    """
+    objects = sync_state['objects'] if sync_state is not None else {}
+    results = []
+    pending = {}
+    skipped_count = 0
+
+    for file_path, filename in files:
+        if sync_state is not None:
+            # Hashes of local files are cached by local path
+            local_state = local_file_state(sync_state, str(file_path), file_path)
+            sync_state['files'][str(file_path)] = local_state
+            sha256 = local_state['sha256']
+        else:
+            sha256 = file_sha256(file_path)
+
+        storage_path = content_addressed_path(sha256, file_path)
+        public_url = get_public_url(storage_path)
+        results.append({
+            'filename': filename,
+            'url': public_url,
+            'storage_path': storage_path
+        })
+
+        if storage_path in pending:
+            skipped_count += 1
+            continue
+
+        if objects.get(sha256) == public_url:
+            skipped_count += 1
+            continue
+
+        if remote_file_exists(storage_path):
+            objects[sha256] = public_url
+            skipped_count += 1
+            continue
+
+        pending[storage_path] = (file_path, filename, sha256, public_url)
+
+    if plan is not None:
+        sizes = [(storage_path, file_path.stat().st_size) for storage_path, (file_path, _, _, _) in pending.items()]
+        with _plan_lock:
+            plan['uploads'].extend(sizes)
+        if pending:
+            print(f"   [PLAN] {len(pending)} file(s) would be uploaded")
+        pending = {}
+
+    # Upload new objects, `jobs` at a time
+    uploads = sync_state['uploads'] if sync_state is not None else None
+    failed_paths = set()
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = {
+            executor.submit(upload_mockup_file, file_path, storage_path, uploads): (storage_path, filename, sha256, public_url)
+            for storage_path, (file_path, filename, sha256, public_url) in pending.items()
+        }
+        for future in as_completed(futures):
+            storage_path, filename, sha256, public_url = futures[future]
+            try:
+                future.result()
+                folder, object_name = storage_path.rsplit('/', 1)
+                mark_remote_file(folder, object_name)
+                objects[sha256] = public_url
+                journal_step('object', sha256=sha256, url=public_url)
+                print(f"   [OK] Uploaded: {filename}")
+
+            except Exception as e:
+                failed_paths.add(storage_path)
+                print(f"   [!]  Failed to upload {filename}: {e}")
+
+    if skipped_count > 0:
+        print(f"   [SKIP] {skipped_count} file(s) already in storage (deduplicated)")
+
+    return [
+        {'filename': item['filename'], 'url': item['url']}
+        for item in results if item['storage_path'] not in failed_paths
+    ]
+
+def upload_mockups_to_storage(mockup_dir, product_slug, skip_existing=True, jobs=DEFAULT_UPLOAD_JOBS, sync_state=None, dedupe=False,
+                              plan=None):
+    """Upload mockup files to Supabase Storage and return URLs
+
+    With dedupe=True files go to content-addressed paths shared by all
+    products instead of the {product_slug}/ folder. With a `plan` dict
+    nothing is uploaded (see upload_files).
+    """
+    print(f"[UP] Checking mockups in Supabase Storage...")
+
+    folder = get_mockup_folder(mockup_dir)
+    files = [(Path(mockup_dir) / filename, filename) for filename in folder['files']]
+    if dedupe:
+        # default.jpg is only found by its {sku}/ path; a content-addressed copy would be unreachable
+        files = [(file_path, filename) for file_path, filename in files if filename != folder['default']]
+        return upload_files_deduplicated(files, jobs=jobs, sync_state=sync_state, plan=plan)
+    return upload_files(files, product_slug, skip_existing=skip_existing, jobs=jobs, sync_state=sync_state, plan=plan)
+
+def rendition_settings_tag():
+    """Short hash of the rendition settings, so changing them invalidates the cache"""
+    settings = json.dumps([RENDITION_WIDTHS, RENDITION_FORMATS, RENDITION_QUALITY], sort_keys=True)
+    return hashlib.sha256(settings.encode('utf-8')).hexdigest()[:8]
+
+def render_renditions(source_path, cache_dir):
+    """Resize and re-encode one image into every rendition width and format
+
+    Runs in a worker process. Writes the renditions plus a renditions.json
+    index into cache_dir and returns the index.
+    """
+    from PIL import Image, ImageOps
+    try:
+        import pillow_avif  # noqa: F401 - AVIF support for Pillow < 11.2
+    except ImportError:
+        pass
+
+    Image.init()
+    formats = [fmt for fmt in RENDITION_FORMATS if fmt.upper() in Image.SAVE]
+
+    cache_dir = Path(cache_dir)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    renditions = []
+
+    with Image.open(source_path) as source:
+        image = ImageOps.exif_transpose(source)
+        image = image.convert('RGBA' if image.mode in ('RGBA', 'LA', 'P') else 'RGB')
+
+        # Never upscale: small images get a single rendition at their own width
+        for width in sorted({min(width, image.width) for width in RENDITION_WIDTHS}):
+            height = max(1, round(image.height * width / image.width))
+            resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+            for fmt in formats:
+                filename = f"{width}.{fmt}"
+                resized.save(cache_dir / filename, fmt.upper(), quality=RENDITION_QUALITY[fmt])
+                renditions.append({'width': width, 'format': fmt, 'file': filename})
+
+    # Written last, so an interrupted encode is never mistaken for a cached one
+    with open(cache_dir / 'renditions.json', 'w') as f:
+        json.dump(renditions, f)
+
+    return renditions
+
+def get_image_pool():
+    """Process pool for encoding renditions, shared across products"""
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is None:
+            from concurrent.futures import ProcessPoolExecutor
+            _image_pool = ProcessPoolExecutor()
+        return _image_pool
+
+def shutdown_image_pool():
+    """Stop the rendition process pool, if one was started"""
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is not None:
+            _image_pool.shutdown()
+            _image_pool = None
+
+def optimize_images(sources, product_slug, sync_state=None, plan=None):
+    """Encode renditions for many images across a process pool
+
+    `sources` is a list of image paths. Returns {source filename: (cache dir, renditions)}.
+    Images whose content hash already has cached renditions are not re-encoded.
+    With a `plan` dict nothing is encoded; uncached images are counted in
+    plan['encodes'] instead.
+    """
+    try:
+        import PIL  # noqa: F401
+    except ImportError:
+        print("   [!]  Pillow is not installed (pip install Pillow), skipping image optimization")
+        return {}
+
+    settings_tag = rendition_settings_tag()
+    optimized = {}
+    pending = []
+
+    for file_path in sources:
+        if sync_state is not None:
+            source_hash = local_file_state(sync_state, f"{product_slug}/{file_path.name}", file_path)['sha256']
+        else:
+            source_hash = file_sha256(file_path)
+
+        cache_dir = RENDITION_CACHE_DIR / f"{source_hash}-{settings_tag}"
+        index_path = cache_dir / 'renditions.json'
+        if index_path.exists():
+            with open(index_path, 'r') as f:
+                optimized[file_path.name] = (cache_dir, json.load(f))
+        else:
+            pending.append((file_path, cache_dir))
+
+    if pending and plan is not None:
+        with _plan_lock:
+            plan['encodes'] += len(pending)
+        print(f"   [PLAN] {len(pending)} image(s) would be encoded")
+    elif pending:
+        print(f"   [IMG] Encoding renditions for {len(pending)} image(s)...")
+        executor = get_image_pool()
+        futures = {
+            executor.submit(render_renditions, str(file_path), str(cache_dir)): (file_path.name, cache_dir)
+            for file_path, cache_dir in pending
+        }
+        with _metrics.timed('encode', sum(file_path.stat().st_size for file_path, _ in pending)):
+            for future in as_completed(futures):
+                filename, cache_dir = futures[future]
+                try:
+                    optimized[filename] = (cache_dir, future.result())
+                except Exception as e:
+                    print(f"   [!]  Failed to optimize {filename}: {e}")
+
+    return optimized
+
+def upload_renditions(mockup_dir, product_slug, jobs=DEFAULT_UPLOAD_JOBS, sync_state=None, dedupe=False, plan=None):
+    """Generate optimized WebP/AVIF renditions of a mockup folder and upload them
+
+    Renditions are stored under {product_slug}/renditions/ (or content-addressed
+    with dedupe=True). Returns {source filename: {format: {width: url}}}.
+    """
+    print(f"[IMG] Optimizing mockups...")
+
+    sources = [
+        Path(mockup_dir) / filename for filename in get_mockup_folder(mockup_dir)['files']
+        if Path(filename).suffix.lower() in ('.jpg', '.jpeg', '.png')
+    ]
+    optimized = optimize_images(sources, product_slug, sync_state, plan=plan)
+
+    files = []
+    for source_name, (cache_dir, renditions) in optimized.items():
+        stem = Path(source_name).stem
+        for rendition in renditions:
+            files.append((cache_dir / rendition['file'], f"{stem}-{rendition['width']}.{rendition['format']}"))
+
+    if dedupe:
+        uploaded = upload_files_deduplicated(files, jobs=jobs, sync_state=sync_state, plan=plan)
+    else:
+        uploaded = upload_files(files, f"{product_slug}/renditions", jobs=jobs, sync_state=sync_state, plan=plan)
+    url_map = {item['filename']: item['url'] for item in uploaded}
+
+    rendition_urls = {}
+    for source_name, (cache_dir, renditions) in optimized.items():
+        stem = Path(source_name).stem
+        for rendition in renditions:
+            url = url_map.get(f"{stem}-{rendition['width']}.{rendition['format']}")
+            if url:
+                rendition_urls.setdefault(source_name, {}).setdefault(rendition['format'], {})[str(rendition['width'])] = url
 
-def append_product_from_mockups(mockup_dir, name, description, price, category='hoodies', tags=None):
-    """Append a new product from mockup directory"""
+    return rendition_urls
+
+def append_product_from_mockups(mockup_dir, name, description, price, category='hoodies', tags=None, jobs=DEFAULT_UPLOAD_JOBS):
+    """Append a new product from mockup directory; returns its ID, or False on failure"""
     print(f"[+] Adding product: {name}")
 
     # Check if mockup directory exists
@@ -289,82 +1717,18 @@ def append_product_from_mockups(mockup_dir, name, description, price, category='
     product_slug = name.lower().replace(' ', '-').replace("'", '')
 
     # Upload mockups to Supabase Storage
-    uploaded_files = upload_mockups_to_storage(mockup_dir, product_slug)
+    uploaded_files = upload_mockups_to_storage(mockup_dir, product_slug, jobs=jobs)
 
     if not uploaded_files:
         print(f"[X] No mockups were uploaded")
         return False
 
-    # Create a mapping of filename to URL
-    url_map = {item['filename']: item['url'] for item in uploaded_files}
-
-    # Parse mockup filenames and organize by color
-    mockups = []
-    size_chart_url = None
-
-    for item in uploaded_files:
-        filename = item['filename']
-        url = item['url']
-
-        # Check for size chart
-        if 'size_chart' in filename.lower():
-            size_chart_url = url
-            continue
-
-        # Parse mockup filename
-        metadata = parse_mockup_filename(filename)
-        if metadata:
-            mockups.append({
-                'url': url,
-                'view': metadata['view'],
-                'view_number': metadata['view_number'],
-                'color_id': metadata['color_id']
-            })
-
-    # Group by color
-    color_groups = {}
-    for mockup in mockups:
-        color_id = mockup['color_id']
-        if color_id not in color_groups:
-            color_groups[color_id] = []
-        color_groups[color_id].append(mockup)
-
-    # Sort images within each color group
-    for color_id in color_groups:
-        color_groups[color_id].sort(key=lambda x: (
-            0 if x['view'].lower() == 'front' else 1 if x['view'].lower() == 'back' else 2,
-            x['view_number']
-        ))
-
-        # Add size chart at the end if it exists
-        if size_chart_url:
-            color_groups[color_id].append({
-                'url': size_chart_url,
-                'view': 'SizeChart',
-                'view_number': 999
-            })
+    color_groups, _ = build_color_groups(uploaded_files, get_mockup_folder(mockup_dir))
 
     if not color_groups:
         print(f"[X] No valid mockups found")
         return False
 
-    # Color mapping (Qikink color IDs)
-    COLOR_MAP = {
-        '1': {'name': 'White', 'hex': '#FFFFFF'},
-        '3': {'name': 'Black', 'hex': '#000000'},
-        '4': {'name': 'Grey', 'hex': '#6b7280'},
-        '9': {'name': 'Navy', 'hex': '#1e3a8a'},
-        '10': {'name': 'Red', 'hex': '#dc2626'},
-        '25': {'name': 'Maroon', 'hex': '#7f1d1d'},
-        '41': {'name': 'Olive Green', 'hex': '#6b7c3e'},
-        '43': {'name': 'Yellow', 'hex': '#eab308'},
-        '45': {'name': 'Pink', 'hex': '#ec4899'},
-        '49': {'name': 'Lavender', 'hex': '#c4b5fd'},
-        '52': {'name': 'Coral', 'hex': '#ff7f7f'},
-        '53': {'name': 'Mint', 'hex': '#98d8c8'},
-        '54': {'name': 'Baby Blue', 'hex': '#a7c7e7'},
-    }
-
     # Get the first color's images for the main product images
     first_color = sorted(color_groups.keys())[0]
     images = [img['url'] for img in color_groups[first_color]]
@@ -393,14 +1757,14 @@ def append_product_from_mockups(mockup_dir, name, description, price, category='
 
     try:
         # Insert the product
-        response = supabase.table('products').insert(product_data).execute()
+        response = execute(supabase.table('products').insert(product_data), idempotent=False)
 
         if response.data:
             print(f"[OK] Product '{name}' added successfully!")
             print(f"   - ID: {response.data[0]['id']}")
             print(f"   - Images: {len(images)} images")
             print(f"   - Colors: {len(color_groups)} color variants")
-            return True
+            return response.data[0]['id']
         else:
             print(f"[X] Failed to add product")
             return False
@@ -409,24 +1773,252 @@ def append_product_from_mockups(mockup_dir, name, description, price, category='
         print(f"[X] Error adding product: {e}")
         return False
 
-def update_product(product_id, **updates):
-    """Update specific fields of a product"""
-    print(f" Updating product ID: {product_id}")
+# Columns shown by the list command
+LIST_COLUMNS = ['id', 'sku', 'name', 'price', 'is_active', 'category_id', 'tags']
+
+def product_filters(category_id=None, tags=None, active=None, sku_prefix=None, search=None):
+    """Query filter (for iter_table) selecting products server-side
+
+    search matches name or SKU, case-insensitively.
+    """
+    def apply(query):
+        if category_id:
+            query = query.eq('category_id', category_id)
+        if tags:
+            query = query.contains('tags', tags)
+        if active is not None:
+            query = query.eq('is_active', active)
+        if sku_prefix:
+            # Escape LIKE wildcards so the prefix is matched literally
+            escaped = re.sub(r'([\\%_])', r'\\\1', sku_prefix)
+            query = query.like('sku', f"{escaped}%")
+        if search:
+            # Quoted so commas/parentheses in the text don't break the or=() filter
+            pattern = re.sub(r'([\\"])', r'\\\1', search)
+            query = query.or_(f'name.ilike."*{pattern}*",sku.ilike."*{pattern}*"')
+        return query
+    return apply
+
+def is_uuid(value):
+    return re.fullmatch(r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', value, re.IGNORECASE) is not None
+
+def resolve_category_id(category):
+    """Category ID for a slug (or an ID passed as-is), or None if unknown"""
+    if is_uuid(category):
+        return category
+    cache = get_catalog_cache()
+    if cache:
+        return cache.category_id(category)
+    return fetch_category_ids([category]).get(category)
+
+def resolve_product_ids(products):
+    """{product: ID} for SKUs (and IDs, passed as-is); unknown SKUs are left out"""
+    ids = {product: product for product in products if is_uuid(product)}
+    skus = list(dict.fromkeys(product for product in products if not is_uuid(product)))
+    if not skus:
+        return ids
+
+    cache = get_catalog_cache()
+    if cache:
+        ids.update(cache.product_ids_by_sku(skus))
+        return ids
+    for start in range(0, len(skus), SKU_FILTER_CHUNK_SIZE):
+        query = supabase.table('products').select('id, sku').in_('sku', skus[start:start + SKU_FILTER_CHUNK_SIZE])
+        ids.update((row['sku'], row['id']) for row in execute(query, phase='db_read').data or [])
+    return ids
+
+def resolve_product_id(product):
+    """Product ID for a SKU (or an ID passed as-is), or None if unknown"""
+    return resolve_product_ids([product]).get(product)
+
+def list_products(category=None, tags=None, active=None, sku_prefix=None, search=None, output_format='table'):
+    """List products with their IDs
+
+    Rows come from the local catalog cache, or (with --no-cache) are
+    streamed page by page with the filters applied server-side.
+    output_format is 'table', 'json' (one JSON object per line) or 'csv';
+    for json/csv only the rows go to stdout and status messages go to stderr.
+    """
+    log = sys.stdout if output_format == 'table' else sys.stderr
+    print("[LIST] Fetching products...", file=log)
+
+    try:
+        cache = get_catalog_cache(log)
+        category_id = None
+        if category:
+            category_id = resolve_category_id(category)
+            if not category_id:
+                print(f"[X] Category '{category}' not found", file=log)
+                return
+
+        if cache:
+            rows = ({column: product.get(column) for column in LIST_COLUMNS}
+                    for product in cache.products(category_id, tags, active, sku_prefix, search))
+        else:
+            rows = iter_table('products', ', '.join(LIST_COLUMNS),
+                              filters=product_filters(category_id, tags, active, sku_prefix, search))
+        total = 0
+
+        if output_format == 'json':
+            for product in rows:
+                print(json.dumps(product))
+                total += 1
+        elif output_format == 'csv':
+            writer = csv.writer(sys.stdout)
+            writer.writerow(LIST_COLUMNS)
+            for product in rows:
+                product['tags'] = ','.join(product.get('tags') or [])
+                writer.writerow([product.get(column) for column in LIST_COLUMNS])
+                total += 1
+        else:
+            for product in rows:
+                if total == 0:
+                    print(f"\n{'ID':<38} {'Name':<40} {'Price':<10} {'Tags'}")
+                    print("-" * 120)
+                tags_str = ', '.join(product.get('tags', [])[:3]) if product.get('tags') else ''  # Show first 3 tags
+                print(f"{product['id']:<38} {product['name']:<40} {product['price']:<9} {tags_str}")
+                total += 1
+
+        if total:
+            print(f"\nTotal: {total} products", file=log)
+        else:
+            print("No products found", file=log)
+
+    except BrokenPipeError:
+        # Output piped into e.g. `head` that exited early
+        sys.stdout = open(os.devnull, 'w')
+    except Exception as e:
+        print(f"[X] Error fetching products: {e}", file=log)
+
+def read_skus_file(path):
+    """SKUs listed in a file, one per line (blank lines and # comments ignored)"""
+    with open(path, 'r') as f:
+        return [line.strip() for line in f if line.strip() and not line.lstrip().startswith('#')]
+
+def product_selector(product_id=None, category=None, tags=None, skus=None, sku_prefix=None, active=None):
+    """Build a selector for bulk commands, or None if nothing was selected
+
+    The product may be a SKU or an ID and the category a slug or an ID.
+    Raises ValueError for an unknown product or category.
+    """
+    selector = {}
+    if product_id:
+        resolved_id = resolve_product_id(product_id)
+        if not resolved_id:
+            raise ValueError(f"No product with ID or SKU '{product_id}'")
+        selector['ids'] = [resolved_id]
+    if category:
+        category_id = resolve_category_id(category)
+        if not category_id:
+            raise ValueError(f"Category '{category}' not found")
+        selector['category'] = category
+        selector['category_id'] = category_id
+    if tags:
+        selector['tags'] = tags
+    if skus is not None:
+        selector['skus'] = skus
+    if sku_prefix:
+        selector['sku_prefix'] = sku_prefix
+    if active is not None:
+        selector['active'] = active
+    return selector or None
+
+def describe_selector(selector):
+    """Human readable summary of a selector"""
+    parts = []
+    if selector.get('ids'):
+        parts.append(f"ID {', '.join(selector['ids'])}")
+    if selector.get('category'):
+        parts.append(f"category {selector['category']}")
+    if selector.get('tags'):
+        parts.append(f"tags {', '.join(selector['tags'])}")
+    if 'skus' in selector:
+        parts.append(f"{len(selector['skus'])} SKU(s)")
+    if selector.get('sku_prefix'):
+        parts.append(f"SKU prefix {selector['sku_prefix']}")
+    if 'active' in selector:
+        parts.append('active' if selector['active'] else 'inactive')
+    return ', '.join(parts)
+
+def selector_filters(selector):
+    """Query filters matching a selector, one per request
+
+    Long SKU lists are split into chunks of SKU_FILTER_CHUNK_SIZE so the
+    request URLs stay short; everything else is a single filter.
+    """
+    filters = product_filters(selector.get('category_id'), selector.get('tags'),
+                              selector.get('active'), selector.get('sku_prefix'))
+
+    def base(query):
+        query = filters(query)
+        if selector.get('ids'):
+            query = query.in_('id', selector['ids'])
+        return query
+
+    if 'skus' not in selector:
+        return [base]
+
+    skus = selector['skus']
+    return [
+        lambda query, chunk=skus[start:start + SKU_FILTER_CHUNK_SIZE]: base(query).in_('sku', chunk)
+        for start in range(0, len(skus), SKU_FILTER_CHUNK_SIZE)
+    ]
+
+def count_products(selector):
+    """Number of products matching a selector"""
+    return sum(
+        execute(apply(supabase.table('products').select('id', count='exact').limit(1))).count or 0
+        for apply in selector_filters(selector)
+    )
+
+def mockup_dir_images(mockup_dir):
+    """Image URLs of the first color in a mockup folder (empty if it has none)"""
+    color_groups = group_mockups_by_color(mockup_dir)
+    if not color_groups:
+        return []
+    first_color = sorted(color_groups.keys())[0]
+    return [img['url'] for img in color_groups[first_color]]
+
+def apply_product_updates(selector, updates):
+    """UPDATE every product matching a selector; returns the number updated"""
+    updated = 0
+    for apply in selector_filters(selector):
+        response = execute(apply(supabase.table('products').update(updates, count='exact', returning='minimal')))
+        updated += response.count or 0
+    return updated
+
+def apply_product_deletes(selector):
+    """DELETE every product matching a selector; returns the number deleted"""
+    deleted = 0
+    for apply in selector_filters(selector):
+        response = execute(apply(supabase.table('products').delete(count='exact', returning='minimal')))
+        deleted += response.count or 0
+    return deleted
+
+def update_products(selector, updates, dry_run=False):
+    """Update fields of every product matching a selector
+
+    One UPDATE request is sent per selector filter (usually just one),
+    however many products match.
+    """
+    print(f"[UPD] Updating products ({describe_selector(selector)})")
 
     if not updates:
         print("[X] No updates provided")
         return False
 
-    # If mockup_dir is provided, regenerate images
+    # If mockup_dir is provided, regenerate images (single product only)
     if 'mockup_dir' in updates:
         mockup_dir = updates.pop('mockup_dir')
-        mockup_path = Path(mockup_dir)
 
-        if mockup_path.exists():
-            color_groups = group_mockups_by_color(mockup_dir)
-            if color_groups:
-                first_color = sorted(color_groups.keys())[0]
-                updates['images'] = [img['url'] for img in color_groups[first_color]]
+        if len(selector) != 1 or len(selector.get('ids', [])) != 1:
+            print(f"[X] mockup_dir can only be updated for a single product ID")
+            return False
+
+        if Path(mockup_dir).exists():
+            images = mockup_dir_images(mockup_dir)
+            if images:
+                updates['images'] = images
                 print(f"   - Updated images from {mockup_dir}")
         else:
             print(f"[!]  Mockup directory not found: {mockup_dir}, skipping image update")
@@ -436,140 +2028,692 @@ def update_product(product_id, **updates):
         updates['tags'] = updates['tags'].split(',')
 
     try:
-        response = supabase.table('products').update(updates).eq('id', product_id).execute()
+        if dry_run:
+            print(f"[DRY RUN] Would update {count_products(selector)} product(s)")
+            return True
 
-        if response.data:
-            print(f"[OK] Product updated successfully!")
+        updated = apply_product_updates(selector, updates)
+        if updated:
+            print(f"[OK] Updated {updated} product(s)")
             for key, value in updates.items():
                 print(f"   - {key}: {value}")
             return True
         else:
-            print(f"[X] Failed to update product")
+            print(f"[X] No matching products to update")
             return False
 
     except Exception as e:
-        print(f"[X] Error updating product: {e}")
+        print(f"[X] Error updating products: {e}")
         return False
 
-def list_products():
-    """List all products with their IDs"""
-    print("[LIST] Fetching products...")
+def delete_products(selector, dry_run=False):
+    """Delete every product matching a selector"""
+    print(f"Deleting products ({describe_selector(selector)})")
 
     try:
-        response = supabase.table('products').select('id, name, price, tags').execute()
+        if dry_run:
+            print(f"[DRY RUN] Would delete {count_products(selector)} product(s)")
+            return True
 
-        if response.data:
-            print(f"\n{'ID':<38} {'Name':<40} {'Price':<10} {'Tags'}")
-            print("-" * 120)
-            for product in response.data:
-                tags_str = ', '.join(product.get('tags', [])[:3]) if product.get('tags') else ''  # Show first 3 tags
-                print(f"{product['id']:<38} {product['name']:<40} {product['price']:<9} {tags_str}")
-            print(f"\nTotal: {len(response.data)} products")
+        deleted = apply_product_deletes(selector)
+        if deleted:
+            print(f"[OK] Deleted {deleted} product(s)")
+            return True
         else:
-            print("No products found")
+            print(f"[X] No matching products to delete (may not exist)")
+            return False
 
     except Exception as e:
-        print(f"[X] Error fetching products: {e}")
+        print(f"[X] Error deleting products: {e}")
+        return False
 
-def delete_product(product_id):
-    """Delete a product by ID"""
-    print(f"Deleting product ID: {product_id}")
+def set_product_sizes(selector, sizes):
+    """Set (or with sizes=None remove) variants.sizes on every matching product
 
+    Runs as a single server-side UPDATE through the bulk_set_product_sizes()
+    function from migrations/consolidated_schema.sql. Databases without the
+    function fall back to a read-modify-write per product.
+    Returns the number of products changed.
+    """
     try:
-        response = supabase.table('products').delete().eq('id', product_id).execute()
-
-        if response.data:
-            print(f"[OK] Product deleted successfully!")
-            return True
-        else:
-            print(f"[X] Failed to delete product (may not exist)")
-            return False
-
+        response = execute(supabase.rpc('bulk_set_product_sizes', {
+            'new_sizes': sizes,
+            'product_ids': selector.get('ids'),
+            'product_skus': selector.get('skus'),
+            'filter_category_id': selector.get('category_id'),
+            'filter_tags': selector.get('tags'),
+            'filter_sku_prefix': selector.get('sku_prefix'),
+            'filter_active': selector.get('active')
+        }))
+        return response.data or 0
     except Exception as e:
-        print(f"[X] Error deleting product: {e}")
-        return False
+        if not is_missing_function(e):
+            raise
+        print("[!]  bulk_set_product_sizes() not found (run migrations/consolidated_schema.sql), "
+              "updating products one by one")
+
+    changed = 0
+    for apply in selector_filters(selector):
+        for product in iter_table('products', 'id, variants', filters=apply):
+            variants = product.get('variants') or {}
+            if sizes is None:
+                if 'sizes' not in variants:
+                    continue
+                del variants['sizes']
+            else:
+                variants['sizes'] = sizes
+            execute(supabase.table('products').update({'variants': variants}).eq('id', product['id']))
+            changed += 1
+    return changed
 
-def add_sizes(product_id, sizes_str):
-    """Add sizes to a product's variants"""
-    print(f"[+] Adding sizes to product ID: {product_id}")
+def add_sizes(selector, sizes_str, dry_run=False):
+    """Set the sizes of every matching product's variants"""
+    print(f"[+] Adding sizes to products ({describe_selector(selector)})")
 
     # Parse sizes from comma-separated string
     sizes = [s.strip() for s in sizes_str.split(',')]
 
     try:
-        # Get current product data
-        response = supabase.table('products').select('variants').eq('id', product_id).execute()
+        if dry_run:
+            print(f"[DRY RUN] Would set sizes {', '.join(sizes)} on {count_products(selector)} product(s)")
+            return True
 
-        if not response.data:
-            print(f"[X] Product not found")
+        changed = set_product_sizes(selector, sizes)
+        if changed:
+            print(f"[OK] Sizes added to {changed} product(s): {', '.join(sizes)}")
+            return True
+        else:
+            print(f"[X] No matching products found")
             return False
 
-        # Get current variants or create empty dict
-        variants = response.data[0].get('variants') or {}
-
-        # Add sizes
-        variants['sizes'] = sizes
+    except Exception as e:
+        print(f"[X] Error adding sizes: {e}")
+        return False
 
-        # Update product
-        update_response = supabase.table('products').update({'variants': variants}).eq('id', product_id).execute()
+def remove_sizes(selector, dry_run=False):
+    """Remove sizes from every matching product's variants"""
+    print(f"[-] Removing sizes from products ({describe_selector(selector)})")
 
-        if update_response.data:
-            print(f"[OK] Sizes added: {', '.join(sizes)}")
+    try:
+        if dry_run:
+            print(f"[DRY RUN] Would remove sizes from {count_products(selector)} product(s)")
             return True
+
+        changed = set_product_sizes(selector, None)
+        if changed:
+            print(f"[OK] Sizes removed from {changed} product(s)")
         else:
-            print(f"[X] Failed to update product")
-            return False
+            print(f"[!] No matching products with sizes to remove")
+        return True
 
     except Exception as e:
-        print(f"[X] Error adding sizes: {e}")
+        print(f"[X] Error removing sizes: {e}")
         return False
 
-def remove_sizes(product_id):
-    """Remove sizes from a product's variants"""
-    print(f"[-] Removing sizes from product ID: {product_id}")
+# Operations accepted by the batch command
+BATCH_OPS = ('update', 'delete', 'add-sizes', 'remove-sizes', 'append')
 
-    try:
-        # Get current product data
-        response = supabase.table('products').select('variants').eq('id', product_id).execute()
+# Keys of a batch operation that select products like the bulk command options do
+BATCH_SELECTOR_KEYS = ('category', 'tags', 'skus', 'sku_prefix', 'active')
 
-        if not response.data:
-            print(f"[X] Product not found")
-            return False
+def split_list(value):
+    """A list from a JSON list or a comma-separated string"""
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return list(value or [])
 
-        # Get current variants
-        variants = response.data[0].get('variants') or {}
+def batch_updates(op, single=True):
+    """The field updates of a batch `update` operation (its "set" object)
 
-        # Remove sizes if they exist
-        if 'sizes' in variants:
-            del variants['sizes']
+    Raises ValueError if they are missing or invalid.
+    """
+    updates = op.get('set')
+    if not isinstance(updates, dict) or not updates:
+        raise ValueError('"set" must be an object of field updates')
+    updates = dict(updates)
+    if 'id' in updates:
+        raise ValueError('the product ID cannot be changed')
 
-            # Update product
-            update_response = supabase.table('products').update({'variants': variants}).eq('id', product_id).execute()
+    if 'mockup_dir' in updates:
+        mockup_dir = updates.pop('mockup_dir')
+        if not single:
+            raise ValueError('mockup_dir can only be updated for a single product')
+        if not Path(mockup_dir).exists():
+            raise ValueError(f"Mockup directory not found: {mockup_dir}")
+        updates['images'] = mockup_dir_images(mockup_dir)
+        if not updates['images']:
+            raise ValueError(f"No valid mockups found in {mockup_dir}")
+    if isinstance(updates.get('tags'), str):
+        updates['tags'] = split_list(updates['tags'])
+    return updates
+
+def batch_sizes(op):
+    """The sizes of a batch `add-sizes` operation; raises ValueError if there are none"""
+    sizes = split_list(op.get('sizes'))
+    if not sizes:
+        raise ValueError('"sizes" must list at least one size')
+    return sizes
+
+def is_single_product_op(op):
+    """Whether a batch operation edits one product, so it can be folded into a bulk write"""
+    return op['op'] != 'append' and 'product' in op and not any(key in op for key in BATCH_SELECTOR_KEYS)
+
+def batch_result(line, op, **fields):
+    result = {'line': line, 'op': op.get('op')}
+    if 'ref' in op:
+        result['ref'] = op['ref']
+    result.update(fields)
+    return result
+
+def apply_single_product_ops(ops, dry_run=False, jobs=DEFAULT_UPLOAD_JOBS):
+    """Run (line, op) single-product operations as a few bulk requests
+
+    The products are fetched in one query and every operation is checked
+    and applied to them in order locally. Only the changed columns are then
+    written: one UPDATE ... WHERE id IN (...) per distinct set of changes,
+    sizes through bulk_set_product_sizes() (so the rest of variants is left
+    alone) and deletes with one DELETE, up to `jobs` requests at a time.
+    Products that disappeared in the meantime are reported as failed, never
+    re-created. Returns one result per operation.
+    """
+    ids = resolve_product_ids([str(op['product']) for _, op in ops])
+    wanted = list(dict.fromkeys(ids.values()))
+    rows = {}
+    for start in range(0, len(wanted), SKU_FILTER_CHUNK_SIZE):
+        chunk = wanted[start:start + SKU_FILTER_CHUNK_SIZE]
+        for row in iter_table('products', filters=lambda query, chunk=chunk: query.in_('id', chunk)):
+            rows[row['id']] = row
+
+    # Per product: column -> new value, and sizes to set (None removes them) when variants is not replaced whole
+    changes = {}
+    sizes = {}
+    deleted = set()
+    results = []
+    for line, op in ops:
+        product_id = ids.get(str(op['product']))
+        row = rows.get(product_id)
+        try:
+            if row is None:
+                raise ValueError(f"No product with ID or SKU '{op['product']}'")
+            if product_id in deleted:
+                raise ValueError('product was deleted earlier in this batch')
+
+            product_changes = changes.setdefault(product_id, {})
+            if op['op'] == 'delete':
+                deleted.add(product_id)
+            elif op['op'] == 'update':
+                updates = batch_updates(op)
+                unknown = set(updates) - set(row)
+                if unknown:
+                    raise ValueError(f"Unknown field(s): {', '.join(sorted(unknown))}")
+                product_changes.update(updates)
+                if 'variants' in updates:
+                    sizes.pop(product_id, None)
+            else:
+                new_sizes = batch_sizes(op) if op['op'] == 'add-sizes' else None
+                if 'variants' in product_changes:
+                    variants = dict(product_changes['variants'] or {})
+                    if new_sizes is None:
+                        variants.pop('sizes', None)
+                    else:
+                        variants['sizes'] = new_sizes
+                    product_changes['variants'] = variants
+                else:
+                    sizes[product_id] = new_sizes
+        except ValueError as e:
+            results.append(batch_result(line, op, ok=False, error=str(e)))
+            continue
+        results.append(batch_result(line, op, ok=True, product=product_id))
 
-            if update_response.data:
-                print(f"[OK] Sizes removed from product")
-                return True
+    # Group the products by identical change so each group is one request
+    groups = {}
+    for product_id, product_changes in changes.items():
+        if product_id in deleted:
+            continue
+        row = rows[product_id]
+        payload = {field: value for field, value in product_changes.items() if not same_value(value, row.get(field))}
+        if payload:
+            groups.setdefault(('update', json.dumps(payload, sort_keys=True)), []).append(product_id)
+    for product_id, new_sizes in sizes.items():
+        current = (rows[product_id].get('variants') or {}).get('sizes')
+        if product_id not in deleted and (current != new_sizes if new_sizes is not None else current is not None):
+            groups.setdefault(('sizes', json.dumps(new_sizes)), []).append(product_id)
+    if deleted:
+        groups[('delete', None)] = list(deleted)
+
+    writes = [
+        (kind, value, product_ids[start:start + SKU_FILTER_CHUNK_SIZE])
+        for (kind, value), product_ids in groups.items()
+        for start in range(0, len(product_ids), SKU_FILTER_CHUNK_SIZE)
+    ]
+
+    def write(kind, value, product_ids):
+        """Send one write; returns {product ID: error} for the products it could not change"""
+        try:
+            if kind == 'update':
+                query = supabase.table('products').update(json.loads(value), count='exact', returning='minimal')
+                count = execute(query.in_('id', product_ids)).count
+            elif kind == 'sizes':
+                count = set_product_sizes({'ids': product_ids}, json.loads(value))
             else:
-                print(f"[X] Failed to update product")
-                return False
+                count = execute(supabase.table('products').delete(count='exact', returning='minimal')
+                                .in_('id', product_ids)).count
+        except Exception as e:
+            return {product_id: str(e) for product_id in product_ids}
+        if count is not None and count >= len(product_ids):
+            return {}
+        # Fewer rows changed than sent: find the products deleted since they were fetched
+        existing = {row['id'] for row in execute(
+            supabase.table('products').select('id').in_('id', product_ids), phase='db_read').data or []}
+        return {product_id: 'product no longer exists' for product_id in product_ids if product_id not in existing}
+
+    errors = {}
+    if writes and not dry_run:
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            for failed in executor.map(lambda args: write(*args), writes):
+                errors.update(failed)
+
+    written = {product_id for _, _, product_ids in writes for product_id in product_ids}
+    for result in results:
+        if not result['ok']:
+            continue
+        if result['product'] in errors:
+            result.update(ok=False, error=errors[result['product']])
         else:
-            print(f"[!] Product has no sizes to remove")
-            return True
+            result['changed'] = result['product'] in written
+    return results
+
+def apply_batch_op(line, op, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, jobs=DEFAULT_UPLOAD_JOBS):
+    """Run one append or selector-based batch operation; returns its result"""
+    try:
+        if op['op'] == 'append':
+            for key in ('mockup_dir', 'name', 'price'):
+                if key not in op:
+                    raise ValueError(f'"{key}" is required')
+            if dry_run:
+                if not Path(op['mockup_dir']).exists():
+                    raise ValueError(f"Mockup directory not found: {op['mockup_dir']}")
+                return batch_result(line, op, ok=True)
+            product_id = append_product_from_mockups(op['mockup_dir'], op['name'], op.get('description', ''),
+                                                     int(op['price']), op.get('category', 'hoodies'),
+                                                     split_list(op.get('tags')), jobs=jobs)
+            if not product_id:
+                raise ValueError('product could not be added (see log)')
+            return batch_result(line, op, ok=True, product=product_id)
+
+        selector = product_selector(
+            product_id=str(op['product']) if 'product' in op else None,
+            category=op.get('category'),
+            tags=split_list(op['tags']) if 'tags' in op else None,
+            skus=split_list(op['skus']) if 'skus' in op else None,
+            sku_prefix=op.get('sku_prefix'),
+            active=op.get('active')
+        )
+        if not selector:
+            raise ValueError('no "product" or selector given')
+
+        if op['op'] == 'update':
+            updates = batch_updates(op, single=len(selector) == 1 and len(selector.get('ids', [])) == 1)
+        elif op['op'] == 'add-sizes':
+            sizes = batch_sizes(op)
+
+        if dry_run:
+            count = count_products(selector)
+        elif op['op'] == 'update':
+            count = apply_product_updates(selector, updates)
+        elif op['op'] == 'delete':
+            count = apply_product_deletes(selector)
+        else:
+            count = set_product_sizes(selector, sizes if op['op'] == 'add-sizes' else None)
+        return batch_result(line, op, ok=True, count=count)
 
     except Exception as e:
-        print(f"[X] Error removing sizes: {e}")
+        return batch_result(line, op, ok=False, error=str(e))
+
+def run_batch(path=None, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, jobs=DEFAULT_UPLOAD_JOBS):
+    """Run a JSONL stream of operations from a file (or stdin) over one session
+
+    Each line is an object such as
+      {"op": "update", "product": "<id or SKU>", "set": {"price": 999}}
+      {"op": "add-sizes", "product": "<id or SKU>", "sizes": "S,M,L"}
+      {"op": "delete", "category": "hoodies", "tags": ["discontinued"]}
+      {"op": "append", "mockup_dir": "mockups/x", "name": "X", "price": 999}
+    with an optional "ref" echoed back in its result. Consecutive
+    single-product operations are applied together (up to batch_size at a
+    time, see apply_single_product_ops); selector operations and appends run
+    one at a time in between. One JSON result per operation is written to
+    stdout, in input order, as each group finishes; log messages go to stderr.
+    """
+    out = sys.stdout
+    try:
+        stream = sys.stdin if path in (None, '-') else open(path, 'r')
+    except OSError as e:
+        print(f"[X] Cannot read {path}: {e}", file=sys.stderr)
         return False
+    pending = []
+    results = []
+    totals = {'ok': 0, 'failed': 0}
+
+    def emit():
+        if pending:
+            try:
+                results.extend(apply_single_product_ops(pending, dry_run, jobs))
+            except Exception as e:
+                results.extend(batch_result(line, op, ok=False, error=str(e)) for line, op in pending)
+            pending.clear()
+        for result in sorted(results, key=lambda result: result['line']):
+            totals['ok' if result['ok'] else 'failed'] += 1
+            out.write(json.dumps(result) + '\n')
+        out.flush()
+        results.clear()
+
+    # Cap in-flight requests for the concurrent writes of each group
+    set_request_limit(jobs)
+
+    print(f"[BATCH] Running operations from {'stdin' if stream is sys.stdin else path}"
+          f"{' (dry run)' if dry_run else ''}...", file=sys.stderr)
+    try:
+        with redirect_stdout(sys.stderr):
+            for line, text in enumerate(stream, 1):
+                text = text.strip()
+                if not text or text.startswith('#'):
+                    continue
+                op = None
+                try:
+                    op = json.loads(text)
+                    if not isinstance(op, dict) or op.get('op') not in BATCH_OPS:
+                        raise ValueError(f"expected an object with \"op\" one of {', '.join(BATCH_OPS)}")
+                except ValueError as e:
+                    results.append(batch_result(line, op if isinstance(op, dict) else {}, ok=False, error=str(e)))
+                    continue
+
+                if is_single_product_op(op):
+                    pending.append((line, op))
+                    if len(pending) >= batch_size:
+                        emit()
+                else:
+                    emit()
+                    results.append(apply_batch_op(line, op, batch_size, dry_run, jobs))
+                    emit()
+            emit()
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    print(f"[OK] {totals['ok']} operation(s) succeeded, {totals['failed']} failed", file=sys.stderr)
+    return totals['failed'] == 0
+
+def qikink_variant_skus(sku_index, product_data, color_info, sizes):
+    """Map each size of a color variant to its Qikink SKU data
+
+    Uses the product's qikink_product_type (and optional qikink_gender) from
+    the config. Returns ({size: {...}}, [missing sizes]).
+    """
+    product_type = product_data['qikink_product_type']
+    gender = product_data.get('qikink_gender')
+    color_name = color_info.get('qikink_name', color_info['name'])
+
+    skus = {}
+    missing = []
+    for size in sizes:
+        row = sku_index.lookup(product_type, color_name, size, gender)
+        if row:
+            skus[size] = {
+                'sku': row.qikink_sku,
+                'base_price': row.base_price,
+                'shipping_weight': row.shipping_weight
+            }
+        else:
+            missing.append(size)
+
+    return skus, missing
+
+def same_value(local, remote):
+    """Compare a payload value with the value stored in the database
+
+    Numbers compare by value (PostgREST returns DECIMAL columns as floats)
+    and dicts/lists are compared recursively.
+    """
+    if isinstance(local, bool) or isinstance(remote, bool):
+        return local is remote
+    if isinstance(local, (int, float)) and isinstance(remote, (int, float)):
+        return float(local) == float(remote)
+    if isinstance(local, dict) and isinstance(remote, dict):
+        return local.keys() == remote.keys() and all(same_value(value, remote[key]) for key, value in local.items())
+    if isinstance(local, list) and isinstance(remote, list):
+        return len(local) == len(remote) and all(same_value(a, b) for a, b in zip(local, remote))
+    return local == remote
+
+def changed_fields(local_row, remote_row):
+    """Names of the fields in local_row whose value differs from remote_row"""
+    return [field for field, value in local_row.items() if not same_value(value, remote_row.get(field))]
+
+def fetch_remote_categories(slugs):
+    """Database rows of the given categories, as {slug: row}"""
+    slugs = list(slugs)
+    response = execute(supabase.table('categories').select(', '.join(CATEGORY_SYNC_COLUMNS)).in_('slug', slugs),
+                       phase='db_read')
+    return {row['slug']: row for row in response.data or []}
+
+def fetch_remote_products(skus):
+    """Database rows of the given products, as {sku: row}
+
+    Fetched SKU_FILTER_CHUNK_SIZE SKUs per request.
+    """
+    skus = list(skus)
+    remote = {}
+    for start in range(0, len(skus), SKU_FILTER_CHUNK_SIZE):
+        chunk = skus[start:start + SKU_FILTER_CHUNK_SIZE]
+        for row in iter_table('products', ', '.join(PRODUCT_SYNC_COLUMNS), filters=lambda query: query.in_('sku', chunk)):
+            remote[row['sku']] = row
+    return remote
+
+def build_color_groups(uploaded_files, folder=None):
+    """Group uploaded mockups by color ID, ordered Front, Back, then other views
+
+    folder is the mockup folder's index entry (see get_mockup_folder), so
+    filenames are not parsed again; without it they are classified here.
+    Returns (color_groups, default_image_url).
+    """
+    urls = {item['filename']: item['url'] for item in uploaded_files}
+    if folder is None:
+        folder = classify_mockup_files(urls)
+
+    images = [
+        {'url': urls[filename], 'filename': filename, 'view': view, 'view_number': view_number, 'color_id': color_id}
+        for filename, (view, view_number, color_id) in folder['mockups'].items()
+        if filename in urls
+    ]
+    size_chart = None
+    if folder['size_chart'] in urls:
+        size_chart = {'url': urls[folder['size_chart']], 'filename': folder['size_chart'], 'view': 'SizeChart', 'view_number': 999}
+
+    return group_images_by_color(images, size_chart), urls.get(folder['default'])
+
+def prepare_product(product_data, category_id, sync_state, sku_index=None, remote_products=None,
+                    jobs=DEFAULT_UPLOAD_JOBS, force=False, optimize=False, dedupe=False, plan=None):
+    """Upload one product's mockups and build its payload
+
+    Returns a result dict with status 'pending' (payload ready to upsert),
+    'skipped' (same as the database row in `remote_products`) or 'failed'.
+    result['changes'] lists the fields that differ from the database row
+    (None for a new product). With a `plan` dict nothing is uploaded or
+    encoded; the work that would be done is collected in it instead.
+    """
+    name = product_data['name']
+    sku = product_data['sku']
+    result = {'sku': sku, 'name': name, 'status': 'failed', 'payload': None, 'changes': None}
+
+    # Create product slug from SKU
+    product_slug = sku.lower()
+
+    # Upload mockups
+    mockup_dir = Path('mockups') / product_data['mockup_folder']
+    uploaded_files = upload_mockups_to_storage(
+        str(mockup_dir), product_slug, skip_existing=not force, jobs=jobs, sync_state=sync_state, dedupe=dedupe,
+        plan=plan
+    )
+
+    if not uploaded_files:
+        print(f"      [X] No mockups uploaded, skipping product")
+        return result
+
+    # Optimized renditions: source filename -> {format: {width: url}}
+    renditions = {}
+    if optimize:
+        renditions = upload_renditions(
+            str(mockup_dir), product_slug, jobs=jobs, sync_state=sync_state, dedupe=dedupe, plan=plan
+        )
 
-def sync_from_config():
-    """Sync products from products-config.json - simplified workflow"""
+    color_groups, _ = build_color_groups(uploaded_files, get_mockup_folder(str(mockup_dir)))
+
+    if not color_groups:
+        print(f"   [X] No valid color variants found, skipping product")
+        return result
+
+    print(f"   [OK] Found {len(color_groups)} color variant(s)")
+
+    # Get images for main product (first color)
+    first_color = sorted(color_groups.keys())[0]
+    images = [img['url'] for img in color_groups[first_color]]
+
+    # Build color variants
+    color_variants = []
+    for color_id in sorted(color_groups.keys()):
+        color_info = COLOR_MAP.get(color_id, {'name': f'Color {color_id}', 'hex': '#cccccc'})
+        color_variant = {
+            'colorId': color_id,
+            'colorName': color_info['name'],
+            'colorHex': color_info['hex'],
+            'images': [img['url'] for img in color_groups[color_id]]
+        }
+        # One entry per image (same order): {format: {width: url}}
+        if renditions:
+            color_variant['renditions'] = [renditions.get(img['filename'], {}) for img in color_groups[color_id]]
+
+        # Qikink SKU, base price and shipping weight per size
+        if sku_index and product_data.get('qikink_product_type'):
+            qikink_skus, missing_sizes = qikink_variant_skus(
+                sku_index, product_data, color_info, product_data.get('variants', {}).get('sizes', [])
+            )
+            color_variant['qikink'] = qikink_skus
+            if missing_sizes:
+                print(f"   [!] No Qikink SKU for {product_data['qikink_product_type']} / "
+                      f"{color_info.get('qikink_name', color_info['name'])}: {', '.join(missing_sizes)}")
+
+        color_variants.append(color_variant)
+
+    # Merge variants
+    variants_config = product_data.get('variants', {})
+    final_variants = {
+        'colors': color_variants,
+        'sizes': variants_config.get('sizes', []),
+        'price_by_size': variants_config.get('price_by_size', {})
+    }
+
+    # Prepare product payload for Supabase
+    product_payload = {
+        'name': name,
+        'description': product_data.get('description', ''),
+        'price': product_data.get('base_price'),
+        'compare_at_price': product_data.get('compare_at_price'),
+        'sku': sku,
+        'category_id': category_id,
+        'images': images,
+        'is_active': True,
+        'vendor': product_data.get('vendor'),
+        'product_type': product_data.get('product_type'),
+        'material': product_data.get('material'),
+        'variants': final_variants,
+        'tags': product_data.get('tags', [])
+    }
+
+    # Skip the upsert if the database row already matches
+    remote_row = (remote_products or {}).get(sku)
+    if remote_row:
+        result['changes'] = changed_fields(product_payload, remote_row)
+        if not result['changes'] and not force:
+            print(f"   [SKIP] Product unchanged in database")
+            result['status'] = 'skipped'
+            return result
+
+    print(f"   [OK] Ready to sync: {len(images)} image(s), {len(color_variants)} color(s), "
+          f"{len(final_variants.get('sizes', []))} size(s)")
+    result.update(status='pending', payload=product_payload)
+    return result
+
+def run_product(output, product_data, category_id, **options):
+    """Prepare one product on a worker thread, printing its output as one block"""
+    started = time.perf_counter()
+    with output.group():
+        print(f"   [+] Processing: {product_data['name']}")
+        try:
+            result = prepare_product(product_data, category_id, **options)
+        except Exception as e:
+            print(f"   [X] Error processing product: {e}")
+            result = {'sku': product_data.get('sku'), 'name': product_data['name'], 'status': 'failed',
+                      'payload': None, 'changes': None}
+        print()
+    result['elapsed'] = time.perf_counter() - started
+    return result
+
+def print_sync_summary(results, elapsed):
+    """Print the per-product summary table of a sync run"""
+    print(f"\n[SUMMARY]")
+    print(f"{'SKU':<28} {'Name':<36} {'Status':<8} {'Time':>8}")
+    print("-" * 84)
+    for result in results:
+        print(f"{str(result['sku']):<28} {result['name'][:36]:<36} {result['status']:<8} {result.get('elapsed', 0):>7.2f}s")
+
+    counts = {status: sum(1 for result in results if result['status'] == status) for status in ('synced', 'skipped', 'failed')}
+    print(f"\nSynced: {counts['synced']}  Skipped: {counts['skipped']}  Failed: {counts['failed']}  "
+          f"(total {elapsed:.2f}s)")
+
+def sync_from_config(jobs=DEFAULT_UPLOAD_JOBS, force=False, batch_size=DEFAULT_BATCH_SIZE, optimize=False, dedupe=False,
+                     product_jobs=DEFAULT_PRODUCT_JOBS, resume=False, plan=False, only_skus=None):
+    """Sync products from products-config.json - simplified workflow
+
+    Mockup hashes and product payload hashes are recorded in .sync-state.json,
+    so only changed files are uploaded and only changed products are upserted.
+    Pass force=True to ignore the manifest and push everything again.
+
+    Categories and products are written with multi-row upserts of
+    `batch_size` rows instead of one request per row.
+
+    With optimize=True, every mockup also gets resized WebP/AVIF renditions
+    (see RENDITION_WIDTHS), listed per image in variants.colors[].renditions.
+
+    With dedupe=True, files are stored once per content hash under cas/ and
+    shared by every product that uses the same bytes.
+
+    Products with a qikink_product_type are validated against Qikink_skus.csv
+    and each color variant gets a `qikink` map of size -> SKU data.
+
+    Up to `product_jobs` products are processed at once, while at most `jobs`
+    storage/database requests are in flight overall. Returns the per-product
+    results shown in the summary table.
+
+    Completed steps are journaled to .sync-journal.jsonl while the run is in
+    progress. With resume=True an interrupted run's journal is replayed, so
+    finished categories, uploads and products are not repeated.
+
+    Categories and products are fetched from the database up front and only
+    rows that differ from it are written. With plan=True nothing is written
+    at all: the diff (categories, products, changed fields, files and bytes
+    to upload) is printed instead.
+
+    With only_skus (a set), only those products are processed; categories
+    are still diffed and synced as usual (used by the watch command).
+    """
     print("[RUN] Starting product sync from products-config.json...\n")
+    started = time.perf_counter()
 
     # Read config file
     config_path = Path('products-config.json')
     if not config_path.exists():
         print("[X] products-config.json not found in root directory")
         print("    Create it with categories and products")
-        return
+        return []
 
     with open(config_path, 'r') as f:
         config = json.load(f)
@@ -578,12 +2722,21 @@ def sync_from_config():
 
     if not categories:
         print("[X] No categories found in config")
-        return
+        return []
+
+    # Categories whose products are processed (all of them, unless only some SKUs were asked for)
+    product_categories = categories
+    if only_skus is not None:
+        product_categories = {
+            slug: {**data, 'products': [product for product in data.get('products', []) if product.get('sku') in only_skus]}
+            for slug, data in categories.items()
+        }
+        product_categories = {slug: data for slug, data in product_categories.items() if data['products']}
 
     # Count total products (only active categories)
-    active_categories = {slug: data for slug, data in categories.items() if data.get('active', True)}
+    active_categories = {slug: data for slug, data in product_categories.items() if data.get('active', True)}
     total_products = sum(len(cat_data.get('products', [])) for cat_data in active_categories.values())
-    inactive_count = len(categories) - len(active_categories)
+    inactive_count = len(product_categories) - len(active_categories)
 
     print(f"[INFO] Found {len(active_categories)} active category(ies) with {total_products} product(s)")
     if inactive_count > 0:
@@ -591,55 +2744,139 @@ def sync_from_config():
     else:
         print()
 
-    # Color mapping (Qikink color IDs)
-    COLOR_MAP = {
-        '1': {'name': 'White', 'hex': '#FFFFFF'},
-        '3': {'name': 'Black', 'hex': '#000000'},
-        '4': {'name': 'Grey', 'hex': '#6b7280'},
-        '9': {'name': 'Navy', 'hex': '#1e3a8a'},
-        '10': {'name': 'Red', 'hex': '#dc2626'},
-        '25': {'name': 'Maroon', 'hex': '#7f1d1d'},
-        '41': {'name': 'Olive Green', 'hex': '#6b7c3e'},
-        '43': {'name': 'Yellow', 'hex': '#eab308'},
-        '45': {'name': 'Pink', 'hex': '#ec4899'},
-        '49': {'name': 'Lavender', 'hex': '#c4b5fd'},
-        '52': {'name': 'Coral', 'hex': '#ff7f7f'},
-        '53': {'name': 'Mint', 'hex': '#98d8c8'},
-        '54': {'name': 'Baby Blue', 'hex': '#a7c7e7'},
+    # Qikink SKU index, loaded only if a product sets qikink_product_type
+    sku_index = None
+    if any(
+        'qikink_product_type' in {**cat_data.get('defaults', {}), **product}
+        for cat_data in active_categories.values() for product in cat_data.get('products', [])
+    ):
+        try:
+            from qikink_sku_index import load_index
+            sku_index = load_index()
+        except OSError as e:
+            print(f"[!] Could not load Qikink SKUs, skipping SKU validation: {e}\n")
+
+    # Walk the mockup tree once; folders unchanged since the last run come from the index
+    scan_mockups()
+
+    # Cap in-flight storage/database requests for the whole run
+    set_request_limit(jobs)
+
+    # Load the sync manifest (start from scratch when forcing a full push)
+    sync_state = new_sync_state() if force else load_sync_state()
+
+    # Current database rows of every configured category and active product
+    print(f"[DB] Fetching current categories and products...")
+    remote_categories = fetch_remote_categories(categories)
+    remote_products = fetch_remote_products(
+        product['sku'] for cat_data in active_categories.values() for product in cat_data.get('products', [])
+    )
+    print(f"   [OK] {len(remote_categories)} category(ies) and {len(remote_products)} product(s) already in database\n")
+
+    category_rows = [
+        {
+            'name': category_data.get('name', category_slug.title()),
+            'slug': category_slug,
+            'description': category_data.get('description', f'{category_slug} products'),
+            'is_active': category_data.get('active', True)
+        }
+        for category_slug, category_data in categories.items()
+    ]
+    category_changes = {
+        row['slug']: changed_fields(row, remote_categories[row['slug']]) if row['slug'] in remote_categories else None
+        for row in category_rows
     }
 
+    if plan:
+        category_ids = {slug: remote_categories.get(slug, {}).get('id', f'(new {slug})') for slug in categories}
+        results, work_plan = sync_category_products(
+            product_categories, category_ids, sync_state, {}, sku_index=sku_index, remote_products=remote_products,
+            jobs=jobs, force=force, batch_size=batch_size, optimize=optimize, dedupe=dedupe,
+            product_jobs=product_jobs, plan=True
+        )
+        print_sync_plan(category_changes, results, work_plan, batch_size)
+        return results
+
+    # Pick up where an interrupted run stopped, or start a fresh journal
+    global _sync_journal
+    category_ids = {}
+    done_products = {}
+    if resume:
+        entries = read_sync_journal()
+        if entries:
+            category_ids, done_products = replay_sync_journal(entries, sync_state)
+            print(f"[RESUME] Replayed {len(entries)} step(s) from {SYNC_JOURNAL_PATH}\n")
+        else:
+            print(f"[INFO] No interrupted sync to resume, starting a full sync\n")
+    elif SYNC_JOURNAL_PATH.exists():
+        print(f"[!]  Discarding {SYNC_JOURNAL_PATH} from an interrupted sync (use --resume to continue it)\n")
+        SYNC_JOURNAL_PATH.unlink()
+    _sync_journal = SyncJournal()
+    completed = False
+
+    try:
+        if all(slug in category_ids for slug in categories):
+            print(f"[RESUME] Categories already synced\n")
+        else:
+            # Create/update new and changed categories (with their current active status) in one batch
+            category_ids = {slug: row['id'] for slug, row in remote_categories.items()}
+            changed_rows = [row for row in category_rows if force or category_changes[row['slug']] != []]
+            if changed_rows:
+                category_ids.update(ensure_categories(changed_rows, batch_size))
+            else:
+                print(f"[CAT] All {len(category_rows)} category(ies) up to date")
+            for category_slug, category_id in category_ids.items():
+                journal_step('category', slug=category_slug, id=category_id)
+            print()
+
+        results, _ = sync_category_products(
+            product_categories, category_ids, sync_state, done_products, sku_index=sku_index, remote_products=remote_products,
+            jobs=jobs, force=force, batch_size=batch_size, optimize=optimize, dedupe=dedupe, product_jobs=product_jobs
+        )
+        completed = True
+
+    finally:
+        # Persist progress even if the sync is interrupted
+        save_sync_state(sync_state)
+        _sync_journal.close(completed=completed)
+        _sync_journal = None
+
+    _metrics.products = [
+        {'sku': result['sku'], 'status': result['status'], 'seconds': result.get('elapsed', 0)} for result in results
+    ]
+    print_sync_summary(results, time.perf_counter() - started)
+
+    print("\n[DONE] Product sync completed!")
+    return results
+
+def sync_category_products(categories, category_ids, sync_state, done_products, sku_index=None, remote_products=None,
+                           jobs=DEFAULT_UPLOAD_JOBS, force=False, batch_size=DEFAULT_BATCH_SIZE,
+                           optimize=False, dedupe=False, product_jobs=DEFAULT_PRODUCT_JOBS, plan=False):
+    """Upload and upsert the products of every active category
+
+    Products finished by an interrupted run (same fingerprint in
+    `done_products`) are skipped. Changed products are upserted in batches
+    as soon as `batch_size` of them are ready. With plan=True nothing is
+    uploaded or upserted.
+
+    Returns (per-product results in config order, plan dict with the
+    'uploads' and 'encodes' that were skipped in plan mode).
+    """
+    work_plan = {'uploads': [], 'encodes': 0}
+    options = {'force': force, 'optimize': optimize, 'dedupe': dedupe}
+
+    # Collect the products to process: (category ID, merged product config, fingerprint)
+    results = []
+    work = []
+    order = {}
     for category_slug, category_data in categories.items():
         is_active = category_data.get('active', True)
 
         print(f"[CAT] Processing category: {category_data.get('name', category_slug)} (active={is_active})")
 
-        # Always update/create category in database with current active status
-        category_id = None
-        try:
-            # Try to get existing category
-            category_response = supabase.table('categories').select('id').eq('slug', category_slug).execute()
-            if category_response.data and len(category_response.data) > 0:
-                category_id = category_response.data[0]['id']
-                # Update category with current active status
-                supabase.table('categories').update({
-                    'name': category_data.get('name', category_slug.title()),
-                    'description': category_data.get('description', f'{category_slug} products'),
-                    'is_active': is_active
-                }).eq('id', category_id).execute()
-                print(f"   [UPD] Updated category in database (is_active={is_active})")
-            else:
-                # Create category if it doesn't exist
-                new_category = supabase.table('categories').insert({
-                    'name': category_data.get('name', category_slug.title()),
-                    'slug': category_slug,
-                    'description': category_data.get('description', f'{category_slug} products'),
-                    'is_active': is_active
-                }).execute()
-                if new_category.data:
-                    category_id = new_category.data[0]['id']
-                    print(f"   [+] Created category in database (is_active={is_active})")
-        except Exception as e:
-            print(f"   [!] Category error: {e}")
+        category_id = category_ids.get(category_slug)
+        if not category_id:
+            print(f"   [!] Could not get category ID, skipping category\n")
             continue
 
         # Skip product processing for inactive categories
@@ -655,150 +2892,755 @@ def sync_from_config():
             print(f"   [SKIP] No products in this category\n")
             continue
 
-        # Process products in this category
+        queued = len(work)
         for product_config in products:
+            order[product_config.get('sku')] = len(order)
+
             # Skip inactive products
             if not product_config.get('active', True):
                 print(f"   [SKIP] {product_config['name']} (inactive)")
+                results.append({'sku': product_config.get('sku'), 'name': product_config['name'], 'status': 'skipped'})
                 continue
 
-            print(f"   [+] Processing: {product_config['name']}")
-
             # Merge defaults with product-specific config
             product_data = {**defaults, **product_config}
+            fingerprint = product_fingerprint(product_data, category_id, options)
+            if done_products.get(product_data['sku']) == fingerprint:
+                print(f"   [RESUME] {product_data['name']} (already synced)")
+                results.append({'sku': product_data['sku'], 'name': product_data['name'], 'status': 'skipped'})
+                continue
+            work.append((category_id, product_data, fingerprint))
 
-            # Get required fields
-            name = product_data['name']
-            sku = product_data['sku']
-            mockup_folder = product_data['mockup_folder']
+        print(f"   [INFO] {len(work) - queued} product(s) queued\n")
 
-            # Create product slug from SKU
-            product_slug = sku.lower()
+    fingerprints = {product_data['sku']: fingerprint for _, product_data, fingerprint in work}
 
-            # Upload mockups
-            mockup_dir = Path('mockups') / mockup_folder
-            uploaded_files = upload_mockups_to_storage(str(mockup_dir), product_slug)
+    def upsert_pending(pending_products):
+        """Upsert ready products in multi-row batches and journal the ones that synced"""
+        print(f"[DB] Upserting {len(pending_products)} product(s) in batches of {batch_size}...")
+        synced, failures = upsert_rows('products', [result['payload'] for result in pending_products], 'sku', batch_size)
 
-            if not uploaded_files:
-                print(f"      [X] No mockups uploaded, skipping product\n")
+        synced_skus = {row.get('sku') for row in synced}
+        for result in pending_products:
+            if result['sku'] in synced_skus:
+                result['status'] = 'synced'
+                journal_step('product', sku=result['sku'], fingerprint=fingerprints[result['sku']])
+            else:
+                result['status'] = 'failed'
+        for product_payload, error in failures:
+            print(f"   [X] Error syncing product {product_payload['name']}: {error}")
+        print(f"   [OK] Synced {len(synced)} product(s), {len(failures)} failed\n")
+
+    # Process products concurrently; each product's output is printed as one block
+    output = GroupedOutput(sys.stdout)
+    sys.stdout = output
+    executor = ThreadPoolExecutor(max_workers=max(1, product_jobs))
+    try:
+        futures = [
+            executor.submit(
+                run_product, output, product_data, category_id,
+                sync_state=sync_state, sku_index=sku_index, remote_products=remote_products,
+                jobs=jobs, force=force, optimize=optimize, dedupe=dedupe, plan=work_plan if plan else None
+            )
+            for category_id, product_data, _ in work
+        ]
+        pending_products = []
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            if result['status'] == 'skipped':
+                journal_step('product', sku=result['sku'], fingerprint=fingerprints[result['sku']])
+            elif result['status'] == 'pending':
+                pending_products.append(result)
+
+            # Upsert changed products as soon as a full batch is ready
+            if plan:
                 continue
+            if len(pending_products) >= batch_size:
+                upsert_pending(pending_products)
+                pending_products = []
+
+        if pending_products and not plan:
+            upsert_pending(pending_products)
+
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        sys.stdout = output.stream
+        shutdown_image_pool()
+
+    # Keep config order in the summary
+    results.sort(key=lambda result: order.get(result['sku'], -1))
+    return results, work_plan
+
+class ChangeCollector:
+    """Paths reported as changed by the file watcher, gathered until the next sync"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.changed = threading.Event()
+        self.paths = set()
+        self.last_change = 0.0
+        # Polling only notices changes once per interval, so quiet periods must be at least that long
+        self.min_quiet = 0.0
+
+    def add(self, path):
+        with self.lock:
+            self.paths.add(os.path.abspath(path))
+            self.last_change = time.monotonic()
+        self.changed.set()
+
+    def wait(self, debounce):
+        """Block until something changed and then stayed quiet for `debounce` seconds; return the paths"""
+        debounce = max(debounce, self.min_quiet)
+        self.changed.wait()
+        while True:
+            with self.lock:
+                quiet_for = time.monotonic() - self.last_change
+                if quiet_for >= debounce:
+                    paths, self.paths = self.paths, set()
+                    self.changed.clear()
+                    return paths
+            time.sleep(debounce - quiet_for)
+
+def snapshot_watched_files(config_path, mockup_root):
+    """{absolute path: (size, mtime_ns)} of the config file and every file in the mockup folders"""
+    snapshot = {}
+    try:
+        stat = os.stat(config_path)
+        snapshot[os.path.abspath(config_path)] = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        pass
+    try:
+        with os.scandir(mockup_root) as folders:
+            for folder in folders:
+                if not folder.is_dir():
+                    continue
+                with os.scandir(folder.path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            stat = entry.stat()
+                            snapshot[os.path.abspath(entry.path)] = (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        pass
+    return snapshot
+
+def poll_for_changes(collector, config_path, mockup_root, interval, stop):
+    """Feed the collector by comparing snapshots every `interval` seconds (fallback without watchdog)"""
+    previous = snapshot_watched_files(config_path, mockup_root)
+    while not stop.wait(interval):
+        current = snapshot_watched_files(config_path, mockup_root)
+        for path in previous.keys() | current.keys():
+            if previous.get(path) != current.get(path):
+                collector.add(path)
+        previous = current
+
+def start_file_watcher(collector, config_path, mockup_root, poll=False, interval=WATCH_POLL_INTERVAL):
+    """Watch the config file and mockup tree, with inotify & co. via watchdog if installed
+
+    Returns a function that stops the watcher.
+    """
+    if not poll:
+        try:
+            from watchdog.events import FileSystemEventHandler
+            from watchdog.observers import Observer
+        except ImportError:
+            print(f"[INFO] watchdog not installed (pip install watchdog), polling every {interval:g}s")
+        else:
+            class Handler(FileSystemEventHandler):
+                def __init__(self, only=None):
+                    super().__init__()
+                    self.only = only
+
+                def on_any_event(self, event):
+                    # Ignore reads (opened/closed events) and folder timestamp updates
+                    if event.event_type not in ('created', 'modified', 'deleted', 'moved'):
+                        return
+                    if event.is_directory and event.event_type == 'modified':
+                        return
+                    for path in (event.src_path, getattr(event, 'dest_path', None)):
+                        if path and (self.only is None or os.path.abspath(path) == self.only):
+                            collector.add(path)
+
+            observer = Observer()
+            # Editors save the config by writing a new file and renaming it, so watch its folder
+            config_path = os.path.abspath(config_path)
+            observer.schedule(Handler(only=config_path), os.path.dirname(config_path), recursive=False)
+            if os.path.isdir(mockup_root):
+                observer.schedule(Handler(), mockup_root, recursive=True)
+            observer.start()
+
+            def stop_observer():
+                observer.stop()
+                observer.join()
+            return stop_observer
+
+    stop = threading.Event()
+    collector.min_quiet = interval * 1.5
+    thread = threading.Thread(target=poll_for_changes, args=(collector, config_path, mockup_root, interval, stop), daemon=True)
+    thread.start()
+    return stop.set
+
+def load_product_configs(config_path):
+    """{sku: (category slug, merged product config, category active)} from the config file"""
+    with open(config_path, 'r') as f:
+        config = json.load(f)
 
-        # Group mockups by color
-        mockups = []
-        size_chart_url = None
-        default_image_url = None
+    products = {}
+    for category_slug, category_data in config.get('categories', {}).items():
+        defaults = category_data.get('defaults', {})
+        for product_config in category_data.get('products', []):
+            products[product_config.get('sku')] = (
+                category_slug, {**defaults, **product_config}, category_data.get('active', True)
+            )
+    return products
+
+def affected_skus(paths, old_products, new_products, config_path, mockup_root):
+    """SKUs to re-sync after `paths` changed
+
+    A config change selects the products whose merged config changed (or
+    that were added); a mockup change selects the products using that folder.
+    """
+    skus = set()
+    if os.path.abspath(config_path) in paths:
+        skus.update(sku for sku, product in new_products.items() if old_products.get(sku) != product)
+
+    mockup_root = os.path.abspath(mockup_root)
+    folders = set()
+    for path in paths:
+        relative = os.path.relpath(os.path.abspath(path), mockup_root)
+        if not relative.startswith(os.pardir) and relative != os.curdir:
+            folders.add(relative.split(os.sep)[0])
+    skus.update(
+        sku for sku, (_, product_data, _) in new_products.items() if product_data.get('mockup_folder') in folders
+    )
+    return skus
+
+def watch_config(debounce=WATCH_DEBOUNCE, poll=False, config_path='products-config.json', mockup_root='mockups',
+                 **sync_options):
+    """Sync once, then keep syncing the products affected by config and mockup edits
+
+    Bursts of changes (an export writing dozens of files, an editor saving
+    twice) are merged until nothing changed for `debounce` seconds. Each
+    round runs sync_from_config with only the affected SKUs, so it goes
+    through the same manifest, upload and upsert logic as sync-config.
+    Runs until interrupted with Ctrl-C.
+    """
+    collector = ChangeCollector()
+    stop_watcher = start_file_watcher(collector, config_path, mockup_root, poll=poll)
 
-        for item in uploaded_files:
-            filename = item['filename']
-            url = item['url']
+    try:
+        product_configs = load_product_configs(config_path)
+    except (OSError, ValueError) as e:
+        print(f"[X] Could not read {config_path}: {e}")
+        stop_watcher()
+        return
 
-            # Check for default image
-            if filename.lower() == 'default.jpg':
-                default_image_url = url
-                continue
+    # Products whose last sync failed are retried with the next round
+    retry_skus = set()
 
-            # Check for size chart
-            if 'size_chart' in filename.lower():
-                size_chart_url = url
+    try:
+        sync_from_config(**sync_options)
+        save_mockup_index()
+        print(f"\n[WATCH] Watching {config_path} and {mockup_root}/ for changes (Ctrl-C to stop)...")
+
+        while True:
+            paths = collector.wait(debounce)
+
+            previous_configs = product_configs
+            if os.path.abspath(config_path) in paths:
+                try:
+                    product_configs = load_product_configs(config_path)
+                except (OSError, ValueError) as e:
+                    print(f"[!]  Ignoring {config_path} until it is valid again: {e}")
+
+            for sku in previous_configs.keys() - product_configs.keys():
+                print(f"[!]  {sku} was removed from {config_path}; it stays in the database (see the clean command)")
+
+            skus = affected_skus(paths, previous_configs, product_configs, config_path, mockup_root) | retry_skus
+            config_changed = product_configs is not previous_configs
+            if not skus and not config_changed:
                 continue
 
-            # Parse mockup filename
-            metadata = parse_mockup_filename(filename)
-            if metadata:
-                mockups.append({
-                    'url': url,
-                    'view': metadata['view'],
-                    'view_number': metadata['view_number'],
-                    'color_id': metadata['color_id']
-                })
-
-        # Group by color
-        color_groups = {}
-        for mockup in mockups:
-            color_id = mockup['color_id']
-            if color_id not in color_groups:
-                color_groups[color_id] = []
-            color_groups[color_id].append(mockup)
-
-        # Sort images within each color group
-        for color_id in color_groups:
-            color_groups[color_id].sort(key=lambda x: (
-                0 if x['view'].lower() == 'front' else 1 if x['view'].lower() == 'back' else 2,
-                x['view_number']
-            ))
-
-            # Add size chart at the end if it exists
-            if size_chart_url:
-                color_groups[color_id].append({
-                    'url': size_chart_url,
-                    'view': 'SizeChart',
-                    'view_number': 999
-                })
-
-        if not color_groups:
-            print(f"   [X] No valid color variants found, skipping product\n")
-            continue
+            print(f"\n[WATCH] {len(paths)} change(s), syncing {len(skus)} product(s): {', '.join(sorted(skus)) or '(categories only)'}")
+            try:
+                results = sync_from_config(only_skus=skus, **sync_options)
+                retry_skus = {result['sku'] for result in results if result['status'] == 'failed'}
+                save_mockup_index()
+            except Exception as e:
+                retry_skus = skus
+                print(f"[X] Sync failed: {e}")
+            if retry_skus:
+                print(f"[!]  {len(retry_skus)} product(s) failed and will be retried with the next change")
+            print(f"\n[WATCH] Waiting for changes...")
+
+    except KeyboardInterrupt:
+        print("\n[WATCH] Stopped")
+    finally:
+        stop_watcher()
+
+def storage_path_from_url(url, public_prefix):
+    """Storage path of a public product-images URL, or None for other URLs"""
+    if not isinstance(url, str) or not url.startswith(public_prefix):
+        return None
+    return unquote(url[len(public_prefix):].split('?', 1)[0])
+
+def referenced_storage_paths():
+    """Storage paths still in use
+
+    Covers products (images, variants.colors[].images and renditions),
+    categories.image_url and order_items.variant_image, which order history
+    keeps showing after a product's mockups are replaced.
+    """
+    public_prefix = get_public_url('')
+    paths = set()
+
+    def add(url):
+        path = storage_path_from_url(url, public_prefix)
+        if path:
+            paths.add(path)
+
+    for product in iter_table('products', 'id, images, variants'):
+        for url in product.get('images') or []:
+            add(url)
+        variants = product.get('variants') if isinstance(product.get('variants'), dict) else {}
+        for color in variants.get('colors') or []:
+            for url in color.get('images') or []:
+                add(url)
+            for formats in color.get('renditions') or []:
+                for widths in (formats or {}).values():
+                    for url in (widths or {}).values():
+                        add(url)
+
+    for category in iter_table('categories', 'id, image_url', filters=lambda query: query.not_.is_('image_url', 'null')):
+        add(category.get('image_url'))
+    for item in iter_table('order_items', 'id, variant_image', filters=lambda query: query.not_.is_('variant_image', 'null')):
+        add(item.get('variant_image'))
+    return paths
+
+def list_bucket(jobs=DEFAULT_UPLOAD_JOBS):
+    """{storage path: list entry} for every object in the bucket
+
+    Folders are listed concurrently (up to `jobs` at a time), descending
+    into sub-folders as they are found.
+    """
+    objects = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        pending = {executor.submit(list_storage_folder, ''): ''}
+        while pending:
+            future = next(as_completed(pending))
+            folder = pending.pop(future)
+            for entry in future.result():
+                path = f"{folder}/{entry['name']}" if folder else entry['name']
+                if entry.get('id'):
+                    objects[path] = entry
+                else:
+                    pending[executor.submit(list_storage_folder, path)] = path
+    return objects
 
-        print(f"   [OK] Found {len(color_groups)} color variant(s)")
-
-        # Get images for main product (first color)
-        first_color = sorted(color_groups.keys())[0]
-        images = [img['url'] for img in color_groups[first_color]]
-
-        # Build color variants
-        color_variants = []
-        for color_id in sorted(color_groups.keys()):
-            color_info = COLOR_MAP.get(color_id, {'name': f'Color {color_id}', 'hex': '#cccccc'})
-            color_variants.append({
-                'colorId': color_id,
-                'colorName': color_info['name'],
-                'colorHex': color_info['hex'],
-                'images': [img['url'] for img in color_groups[color_id]]
-            })
+def object_modified(entry):
+    """Last-modified time of a storage list entry, or None if unknown"""
+    value = entry.get('updated_at') or entry.get('created_at')
+    if not value:
+        return None
+    try:
+        modified = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    return modified if modified.tzinfo else modified.replace(tzinfo=timezone.utc)
 
-        # Merge variants
-        variants_config = product_data.get('variants', {})
-        final_variants = {
-            'colors': color_variants,
-            'sizes': variants_config.get('sizes', []),
-            'price_by_size': variants_config.get('price_by_size', {})
-        }
+def prune_sync_state(removed_paths):
+    """Forget deleted objects in the sync manifest so the next sync re-uploads them if needed"""
+    if not SYNC_STATE_PATH.exists():
+        return
+    state = load_sync_state()
+    public_prefix = get_public_url('')
+    state['files'] = {path: entry for path, entry in state['files'].items() if path not in removed_paths}
+    state['objects'] = {
+        sha256: url for sha256, url in state['objects'].items()
+        if storage_path_from_url(url, public_prefix) not in removed_paths
+    }
+    state['uploads'] = {path: entry for path, entry in state['uploads'].items() if path not in removed_paths}
+    save_sync_state(state)
+
+def gc_storage(grace_hours=GC_GRACE_HOURS, dry_run=False, jobs=DEFAULT_UPLOAD_JOBS):
+    """Delete product-images objects that no product references
+
+    Objects modified within the last `grace_hours` are kept, so files
+    uploaded by a sync that has not written its products yet survive.
+    With dry_run=True only reports what would be deleted.
+    """
+    print(f"[GC] Collecting unreferenced objects in product-images{' (dry run)' if dry_run else ''}...")
+
+    supabase_credentials()
+    if not dry_run and not os.getenv('SUPABASE_SERVICE_ROLE_KEY'):
+        # With the anon key, row level security may hide products whose images are still in use
+        print("[X] gc-storage needs SUPABASE_SERVICE_ROLE_KEY in .env.local (try --dry-run)")
+        return False
 
-        # Prepare product payload for Supabase
-        product_payload = {
-            'name': name,
-            'description': product_data.get('description', ''),
-            'price': product_data.get('base_price'),
-            'compare_at_price': product_data.get('compare_at_price'),
-            'sku': sku,
-            'category_id': category_id,
-            'images': images,
-            'is_active': True,
-            'vendor': product_data.get('vendor'),
-            'product_type': product_data.get('product_type'),
-            'material': product_data.get('material'),
-            'variants': final_variants,
-            'tags': product_data.get('tags', [])
-        }
+    set_request_limit(jobs)
+    try:
+        referenced = referenced_storage_paths()
+        objects = list_bucket(jobs)
+    except Exception as e:
+        print(f"[X] Error reading products or storage: {e}")
+        return False
 
-        # Upsert product to Supabase
+    if objects and not referenced:
+        print("[X] No product references any stored object; refusing to empty the bucket")
+        return False
+
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=grace_hours)
+    # sync-config uploads default.jpg with every mockup folder without linking it, and Supabase
+    # keeps empty folders alive with a placeholder object; leave both alone
+    folders_in_use = {path.rsplit('/', 1)[0] for path in referenced if '/' in path}
+    orphans = {
+        path: entry for path, entry in objects.items()
+        if path not in referenced and not path.endswith('.emptyFolderPlaceholder')
+        and not (path.endswith('/default.jpg') and path.rsplit('/', 1)[0] in folders_in_use)
+    }
+    recent = {path for path, entry in orphans.items() if (object_modified(entry) or cutoff) >= cutoff}
+    removable = sorted(path for path in orphans if path not in recent)
+    reclaimable = sum((orphans[path].get('metadata') or {}).get('size') or 0 for path in removable)
+
+    print(f"   [OK] {len(objects)} object(s), {len(objects) - len(orphans)} in use, {len(orphans)} unreferenced")
+    if recent:
+        print(f"   [SKIP] {len(recent)} unreferenced object(s) modified in the last {grace_hours:g}h")
+    if not removable:
+        print("[OK] Nothing to delete")
+        return True
+
+    if dry_run:
+        by_folder = {}
+        for path in removable:
+            folder = path.split('/', 1)[0] if '/' in path else '(root)'
+            count, size = by_folder.get(folder, (0, 0))
+            by_folder[folder] = (count + 1, size + ((orphans[path].get('metadata') or {}).get('size') or 0))
+        for folder, (count, size) in sorted(by_folder.items(), key=lambda item: -item[1][1]):
+            print(f"   {folder:<40} {count:>6} object(s) {format_bytes(size):>10}")
+        print(f"[DRY RUN] Would delete {len(removable)} object(s), reclaiming {format_bytes(reclaimable)}")
+        return True
+
+    removed = set()
+    bucket = supabase.storage.from_("product-images")
+    for start in range(0, len(removable), STORAGE_REMOVE_BATCH_SIZE):
+        chunk = removable[start:start + STORAGE_REMOVE_BATCH_SIZE]
         try:
-            response = supabase.table('products').upsert(product_payload, on_conflict='sku').execute()
+            run_request(bucket.remove, chunk, phase='storage_remove')
+            removed.update(chunk)
+        except Exception as e:
+            print(f"   [X] Could not delete {len(chunk)} object(s): {e}")
 
-            if response.data:
-                print(f"   [OK] Synced successfully!")
-                print(f"   - Images: {len(images)}")
-                print(f"   - Colors: {len(color_variants)}")
-                print(f"   - Sizes: {len(final_variants.get('sizes', []))}")
-            else:
-                print(f"   [X] Failed to sync product")
+    prune_sync_state(removed)
+    freed = sum((orphans[path].get('metadata') or {}).get('size') or 0 for path in removed)
+    print(f"[OK] Deleted {len(removed)} object(s), reclaimed {format_bytes(freed)}")
+    return len(removed) == len(removable)
 
-        except Exception as e:
-            print(f"   [X] Error syncing product: {e}")
+def export_catalog(path=None, tables=None):
+    """Stream catalog tables into a gzip-compressed NDJSON snapshot
 
-        print()  # Empty line between products
+    The first line is a header; every other line is {"table": ..., "row": ...}.
+    Tables are read page by page and written as they arrive, so memory use
+    does not grow with the catalog. Returns the path written, or None.
+    """
+    import gzip
 
-    print("[DONE] Product sync completed!")
+    tables = tables or list(SNAPSHOT_TABLES)
+    path = Path(path or f"catalog-{datetime.now():%Y%m%d-%H%M%S}.ndjson.gz")
+    tmp_path = path.with_name(path.name + '.tmp')
+    print(f"[EXPORT] Writing {', '.join(tables)} to {path}...")
+
+    counts = {}
+    try:
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            f.write(json.dumps({'format': SNAPSHOT_FORMAT, 'version': SNAPSHOT_VERSION,
+                                'exported_at': datetime.now(timezone.utc).isoformat(), 'tables': tables}) + '\n')
+            for table in tables:
+                counts[table] = 0
+                for row in iter_table(table):
+                    f.write(json.dumps({'table': table, 'row': row}, separators=(',', ':')) + '\n')
+                    counts[table] += 1
+                print(f"   [OK] {table}: {counts[table]} row(s)")
+        os.replace(tmp_path, path)
+    except Exception as e:
+        tmp_path.unlink(missing_ok=True)
+        print(f"[X] Error exporting catalog: {e}")
+        return None
+
+    print(f"[OK] Exported {sum(counts.values())} row(s) to {path} ({format_bytes(path.stat().st_size)})")
+    return path
+
+def import_catalog(path, batch_size=SNAPSHOT_BATCH_SIZE, dry_run=False, tables=None):
+    """Restore an export_catalog() snapshot with batched upserts
+
+    Rows are read as a stream and upserted batch_size at a time, in file
+    order (categories before the products that reference them). Rows are
+    matched on their natural key (see SNAPSHOT_TABLES): a category or
+    product that already exists under another ID keeps the target's ID, and
+    products' category_id is mapped to match. New categories and products
+    keep their snapshot IDs; products without a SKU are matched on ID.
+    qikink_products get IDs from the target database's sequence.
+    """
+    import gzip
+
+    print(f"[IMPORT] Restoring catalog from {path}{' (dry run)' if dry_run else ''}...")
+    counts = {}
+    failed = {}
+    batch = []
+    batch_table = None
+    # Snapshot category ID -> ID of the same slug in the target database
+    category_ids = {}
+
+    def upsert(rows, on_conflict):
+        _, failures = upsert_rows(batch_table, rows, on_conflict, batch_size, returning='minimal')
+        for row, e in failures:
+            print(f"   [X] {batch_table} {row.get(on_conflict)}: {e}")
+        failed[batch_table] = failed.get(batch_table, 0) + len(failures)
+
+    def flush():
+        if not batch:
+            return
+        if dry_run:
+            pass
+        elif batch_table == 'categories':
+            existing = fetch_remote_categories(row['slug'] for row in batch)
+            rows = []
+            for row in batch:
+                target_id = existing.get(row['slug'], row)['id']
+                category_ids[row['id']] = target_id
+                rows.append({**row, 'id': target_id})
+            upsert(rows, 'slug')
+        elif batch_table == 'products':
+            rows = [{**row, 'category_id': category_ids.get(row.get('category_id'), row.get('category_id'))} for row in batch]
+            existing = fetch_remote_products(row['sku'] for row in rows if row.get('sku'))
+            with_sku = [{**row, 'id': existing.get(row['sku'], row)['id']} for row in rows if row.get('sku')]
+            if with_sku:
+                upsert(with_sku, 'sku')
+            without_sku = [row for row in rows if not row.get('sku')]
+            if without_sku:
+                upsert(without_sku, 'id')
+        else:
+            upsert([{k: v for k, v in row.items() if k != 'id'} for row in batch], SNAPSHOT_TABLES[batch_table])
+        counts[batch_table] = counts.get(batch_table, 0) + len(batch)
+        batch.clear()
+
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            header = json.loads(f.readline() or 'null')
+            if not isinstance(header, dict) or header.get('format') != SNAPSHOT_FORMAT:
+                print(f"[X] {path} is not a catalog snapshot (create one with `export`)")
+                return False
+            if header.get('version') != SNAPSHOT_VERSION:
+                print(f"[X] Unsupported snapshot version {header.get('version')} (expected {SNAPSHOT_VERSION})")
+                return False
+            print(f"   [INFO] Snapshot of {', '.join(header.get('tables', []))} taken {header.get('exported_at')}")
+
+            for line in f:
+                record = json.loads(line)
+                table = record['table']
+                if table not in SNAPSHOT_TABLES or (tables and table not in tables):
+                    continue
+                if table != batch_table or len(batch) >= batch_size:
+                    flush()
+                    batch_table = table
+                batch.append(record['row'])
+            flush()
+    except (OSError, EOFError, ValueError, KeyError) as e:
+        print(f"[X] Could not read {path}: {e}")
+        return False
+
+    for table, count in counts.items():
+        if dry_run:
+            print(f"   [DRY RUN] Would upsert {count} {table} row(s)")
+        else:
+            print(f"   [OK] {table}: {count - failed.get(table, 0)} row(s) upserted, {failed.get(table, 0)} failed")
+    if not counts:
+        print("[!] Snapshot contains no rows")
+    return not any(failed.values())
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if size < 1024 or unit == 'GB':
+            return f"{size:.0f} {unit}" if unit == 'B' else f"{size:.1f} {unit}"
+        size /= 1024
+
+def print_sync_plan(category_changes, results, work_plan, batch_size=DEFAULT_BATCH_SIZE):
+    """Print what a sync would change, without having changed anything"""
+    print(f"\n[PLAN] Nothing was written. A sync would make these changes:\n")
+
+    new_categories = [slug for slug, changes in category_changes.items() if changes is None]
+    changed_categories = {slug: changes for slug, changes in category_changes.items() if changes}
+    print(f"Categories: {len(new_categories)} new, {len(changed_categories)} changed, "
+          f"{len(category_changes) - len(new_categories) - len(changed_categories)} unchanged")
+    for slug in new_categories:
+        print(f"   [+] {slug}")
+    for slug, changes in changed_categories.items():
+        print(f"   [~] {slug}: {', '.join(changes)}")
+
+    pending = [result for result in results if result['status'] == 'pending']
+    new_products = [result for result in pending if result['changes'] is None]
+    changed_products = [result for result in pending if result['changes'] is not None]
+    failed = [result for result in results if result['status'] == 'failed']
+    print(f"\nProducts: {len(new_products)} new, {len(changed_products)} changed, "
+          f"{len(results) - len(pending) - len(failed)} unchanged/skipped, {len(failed)} failing")
+    for result in new_products:
+        print(f"   [+] {result['sku']} {result['name']}")
+    for result in changed_products:
+        print(f"   [~] {result['sku']} {result['name']}: {', '.join(result['changes']) or 'forced'}")
+    for result in failed:
+        print(f"   [X] {result['sku']} {result['name']}")
+
+    # The same content-addressed object may be planned by several products
+    uploads = dict(work_plan['uploads'])
+    print(f"\nFiles: {len(uploads)} to upload ({format_bytes(sum(uploads.values()))})")
+    if work_plan['encodes']:
+        print(f"Renditions: {work_plan['encodes']} image(s) to encode (their uploads are not counted above)")
+
+    # Large files take one request to start the resumable upload plus one per chunk
+    upload_requests = sum(
+        1 + -(-size // RESUMABLE_CHUNK_SIZE) if size > RESUMABLE_UPLOAD_THRESHOLD else 1 for size in uploads.values()
+    )
+    requests = upload_requests + -(-len(pending) // batch_size) + (1 if new_categories or changed_categories else 0)
+    print(f"\nEstimated requests: {requests}")
+
+def print_metrics(elapsed, file=None):
+    """Print the per-phase timing table of the command that just ran"""
+    if not _metrics.phases:
+        return
+    file = file or sys.stdout
+    print(f"\n[TIMING] {'Phase':<14} {'Calls':>7} {'Time':>9} {'Bytes':>10} {'Throughput':>12}", file=file)
+    print("-" * 66, file=file)
+    for phase, stats in sorted(_metrics.phases.items()):
+        throughput = f"{format_bytes(stats['bytes'] / stats['seconds'])}/s" if stats['bytes'] and stats['seconds'] else ''
+        size = format_bytes(stats['bytes']) if stats['bytes'] else ''
+        print(f"         {phase:<14} {stats['calls']:>7} {stats['seconds']:>8.2f}s {size:>10} {throughput:>12}", file=file)
+    retries = f", {_metrics.retries} retried request(s)" if _metrics.retries else ''
+    print(f"Wall time: {elapsed:.2f}s{retries}", file=file)
+
+def prometheus_label(value):
+    """Escape a Prometheus label value"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def write_metrics_report(path, command, elapsed):
+    """Write the command metrics as JSON, or Prometheus text format for *.prom files"""
+    path = Path(path)
+    if path.suffix == '.prom':
+        label = f'command="{prometheus_label(command)}"'
+        lines = [
+            '# HELP upload_products_run_seconds Wall time of the command',
+            '# TYPE upload_products_run_seconds gauge',
+            f'upload_products_run_seconds{{{label}}} {elapsed:.6f}',
+            '# HELP upload_products_retries Requests retried after a transient failure',
+            '# TYPE upload_products_retries gauge',
+            f'upload_products_retries{{{label}}} {_metrics.retries}',
+        ]
+        for metric, key, help_text in (
+            ('upload_products_phase_seconds', 'seconds', 'Time spent per phase (summed over parallel calls)'),
+            ('upload_products_phase_calls', 'calls', 'Calls per phase'),
+            ('upload_products_phase_bytes', 'bytes', 'Bytes processed per phase'),
+        ):
+            lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} gauge']
+            for phase, stats in sorted(_metrics.phases.items()):
+                lines.append(f'{metric}{{{label},phase="{prometheus_label(phase)}"}} {stats[key]}')
+        if _metrics.products:
+            lines += ['# HELP upload_products_product_seconds Time spent preparing each product',
+                      '# TYPE upload_products_product_seconds gauge']
+            for product in _metrics.products:
+                lines.append(
+                    f'upload_products_product_seconds{{{label},sku="{prometheus_label(product["sku"])}",'
+                    f'status="{prometheus_label(product["status"])}"}} {product["seconds"]:.6f}'
+                )
+        content = '\n'.join(lines) + '\n'
+    else:
+        content = json.dumps({
+            'command': command,
+            'wall_seconds': elapsed,
+            'retries': _metrics.retries,
+            'phases': _metrics.phases,
+            'products': _metrics.products
+        }, indent=2) + '\n'
+
+    with open(path, 'w') as f:
+        f.write(content)
+
+def pop_option(name, default=None):
+    """Remove `--name value` or `--name=value` from sys.argv and return the value"""
+    for i, arg in enumerate(sys.argv):
+        if arg == name and i + 1 < len(sys.argv):
+            value = sys.argv[i + 1]
+            del sys.argv[i:i + 2]
+            return value
+        if arg.startswith(f"{name}="):
+            del sys.argv[i]
+            return arg.split('=', 1)[1]
+    return default
+
+def pop_flag(name):
+    """Remove a boolean --flag from sys.argv and return whether it was present"""
+    if name in sys.argv:
+        sys.argv.remove(name)
+        return True
+    return False
+
+def pop_int_option(name, default):
+    """Read a positive integer --name N option, falling back to the default"""
+    value = pop_option(name, default)
+    try:
+        return max(1, int(value))
+    except ValueError:
+        print(f"[!]  Invalid {name} value: {value}, using {default}")
+        return default
+
+def pop_jobs():
+    """Read the --jobs N option (number of parallel uploads)"""
+    return pop_int_option('--jobs', DEFAULT_UPLOAD_JOBS)
+
+def pop_product_jobs():
+    """Read the --product-jobs N option (products processed at once)"""
+    return pop_int_option('--product-jobs', DEFAULT_PRODUCT_JOBS)
+
+def pop_selector(get_product_id):
+    """Read the product selector options shared by the bulk commands
+
+    --category <slug>, --tag <t1,t2>, --skus-file <path>, --sku-prefix <prefix>
+    and --active/--inactive, combined with an optional single product ID that
+    get_product_id picks from the remaining positional arguments.
+    Returns None (after printing why) if nothing valid was selected.
+    """
+    category = pop_option('--category')
+    tags = pop_option('--tag')
+    skus_file = pop_option('--skus-file')
+    sku_prefix = pop_option('--sku-prefix')
+    active = True if pop_flag('--active') else False if pop_flag('--inactive') else None
+
+    try:
+        return product_selector(
+            product_id=get_product_id(sys.argv[2:]),
+            category=category,
+            tags=[tag.strip() for tag in tags.split(',') if tag.strip()] if tags else None,
+            skus=read_skus_file(skus_file) if skus_file else None,
+            sku_prefix=sku_prefix,
+            active=active
+        )
+    except (OSError, ValueError) as e:
+        print(f"[X] {e}")
+        return None
+
+def pop_snapshot_tables():
+    """Read the --tables t1,t2 option of export/import (in restore order), exiting on unknown tables"""
+    tables = pop_option('--tables')
+    if not tables:
+        return None
+    tables = {table.strip() for table in tables.split(',') if table.strip()}
+    unknown = tables - set(SNAPSHOT_TABLES)
+    if unknown:
+        print(f"[X] Unknown table(s): {', '.join(sorted(unknown))} (choose from {', '.join(SNAPSHOT_TABLES)})")
+        sys.exit(1)
+    return [table for table in SNAPSHOT_TABLES if table in tables]
+
+def pop_batch_size():
+    """Read the --batch-size N option (rows per upsert request)"""
+    return pop_int_option('--batch-size', DEFAULT_BATCH_SIZE)
 
 def main():
     if len(sys.argv) < 2:
@@ -806,26 +3648,81 @@ def main():
 [+] Product Management Script
 
 Usage:
-  python scripts/upload_products.py sync-config - Sync products from products-config.json (RECOMMENDED)
-  python scripts/upload_products.py sync        - Upload/update products from products.json
-  python scripts/upload_products.py clean       - Remove products not in products.json
-  python scripts/upload_products.py list        - List all products with IDs
-  python scripts/upload_products.py append <mockup_dir> <name> <price> [description] [category] [tags]
+  python scripts/upload_products.py sync-config [--plan] [--jobs N] [--product-jobs N] [--force] [--resume] [--batch-size N] [--optimize] [--dedupe] - Sync products from products-config.json (RECOMMENDED)
+  python scripts/upload_products.py watch [--debounce SECONDS] [--poll] [--jobs N] [--product-jobs N] [--optimize] [--dedupe] - Sync, then re-sync products as their config or mockups change
+  python scripts/upload_products.py sync [--batch-size N] - Upload/update products from products.json
+  python scripts/upload_products.py clean [config_path] [--delete] [--dry-run] - Deactivate (or delete) products not active in products-config.json
+  python scripts/upload_products.py list [--category slug] [--tag t1,t2] [--active|--inactive] [--sku-prefix P] [--search text] [--json|--csv] - List products with IDs
+  python scripts/upload_products.py import-skus [csv_path] [--batch-size N] [--dry-run] - Load Qikink_skus.csv into qikink_products (changed rows only)
+  python scripts/upload_products.py append <mockup_dir> <name> <price> [description] [category] [tags] [--jobs N]
   python scripts/upload_products.py update <product_id> <field>=<value> [<field>=<value> ...]
   python scripts/upload_products.py delete <product_id> - Delete a product
   python scripts/upload_products.py add-sizes <product_id> <sizes> - Add sizes to a product
   python scripts/upload_products.py remove-sizes <product_id> - Remove sizes from a product
+  python scripts/upload_products.py gc-storage [--grace HOURS] [--dry-run] [--jobs N] - Delete storage objects no product references
+  python scripts/upload_products.py export [snapshot.ndjson.gz] [--tables t1,t2] - Snapshot categories, products and qikink_products
+  python scripts/upload_products.py import <snapshot.ndjson.gz> [--tables t1,t2] [--batch-size N] [--dry-run] - Restore a snapshot
+  python scripts/upload_products.py batch [ops.jsonl|-] [--batch-size N] [--dry-run] [--jobs N] - Run JSONL operations (from stdin by default) in one session
+
+  Every command prints a timing table per phase at the end; add --report <file.json|file.prom>
+  to also write it as JSON or in Prometheus text format.
+
+  list and the category/SKU lookups of the other commands read a local copy of the catalog
+  (.sync-cache/catalog.sqlite) that only fetches rows changed since the last run.
+  --no-cache queries the database directly, --refresh rebuilds the copy from scratch.
+  <product_id> may also be a product SKU.
+
+  update, delete, add-sizes and remove-sizes also accept a selector instead of <product_id>
+  (all options combined), applied with batched server-side queries:
+    --category <slug> --tag <t1,t2> --skus-file <path> --sku-prefix <prefix> --active|--inactive [--dry-run]
 
 Examples:
   # Sync from products-config.json (simple workflow)
   python scripts/upload_products.py sync-config
 
+  # Sync with 8 parallel uploads per product
+  python scripts/upload_products.py sync-config --jobs 8
+
+  # Process 8 products at once, with at most 16 requests in flight
+  python scripts/upload_products.py sync-config --product-jobs 8 --jobs 16
+
+  # Re-upload every mockup and re-upsert every product, ignoring .sync-state.json
+  python scripts/upload_products.py sync-config --force
+
+  # Show what sync-config would change (categories, products, fields, upload size) without writing
+  python scripts/upload_products.py sync-config --plan
+
+  # Record per-phase timings for a dashboard (Prometheus text format; use .json for JSON)
+  python scripts/upload_products.py sync-config --report sync-metrics.prom
+
+  # Keep syncing while you edit mockups or products-config.json (Ctrl-C to stop)
+  python scripts/upload_products.py watch
+
+  # Continue a sync-config run that was interrupted (Ctrl-C, network drop)
+  python scripts/upload_products.py sync-config --resume
+
+  # Also upload resized WebP/AVIF renditions of every mockup (needs Pillow)
+  python scripts/upload_products.py sync-config --optimize
+
+  # Store identical files (size charts, shared mockups) once, content-addressed
+  python scripts/upload_products.py sync-config --dedupe
+
+  # See which products are no longer in products-config.json, then deactivate them
+  python scripts/upload_products.py clean --dry-run
+  python scripts/upload_products.py clean
+
   # Add new product from mockups
   python scripts/upload_products.py append mockups/hoodie_fox "Fox Spirit Hoodie" 1299 "Mystical fox design" hoodies "animals,mystical"
 
   # List all products
   python scripts/upload_products.py list
 
+  # Find products by name or SKU
+  python scripts/upload_products.py list --search fox
+
+  # Export active hoodies as CSV (or one JSON object per line with --json)
+  python scripts/upload_products.py list --category hoodies --active --csv > hoodies.csv
+
   # Delete a product
   python scripts/upload_products.py delete 560ff9d5-1e62-4968-b700-2967fb7eb66c
 
@@ -838,12 +3735,35 @@ Examples:
   # Update product tags
   python scripts/upload_products.py update 5 tags="nature,wildlife,cool"
 
+  # Set sizes on every hoodie, or change the price of the SKUs listed in a file
+  python scripts/upload_products.py add-sizes "S,M,L,XL,XXL" --category hoodies
+  python scripts/upload_products.py update --skus-file skus.txt price=1199
+
+  # Preview how many products a bulk delete would remove
+  python scripts/upload_products.py delete --tag discontinued --dry-run
+
   # Update product category and price
   python scripts/upload_products.py update 5 category=t-shirts price=999
 
   # Update product images from new mockup directory
   python scripts/upload_products.py update 5 mockup_dir=mockups/hoodie_fox_v2
 
+  # Apply many edits in one process, one JSON result per line on stdout
+  #   {"op": "update", "product": "HOODIE-FOX-001", "set": {"price": 1199}}
+  #   {"op": "add-sizes", "product": "HOODIE-OWL-001", "sizes": "S,M,L"}
+  python scripts/upload_products.py batch edits.jsonl > results.jsonl
+
+  # See how much space old mockups take, then delete the ones no product uses (kept for 24h by default)
+  python scripts/upload_products.py gc-storage --dry-run
+  python scripts/upload_products.py gc-storage --grace 72
+
+  # Clone the production catalog into a staging project (run import with staging's .env.local)
+  python scripts/upload_products.py export prod-catalog.ndjson.gz
+  python scripts/upload_products.py import prod-catalog.ndjson.gz
+
+  # Re-import Qikink SKUs after a price update (only changed rows are written)
+  python scripts/upload_products.py import-skus
+
 Setup:
   1. pip install supabase python-dotenv
   2. Ensure .env.local has NEXT_PUBLIC_SUPABASE_URL and NEXT_PUBLIC_SUPABASE_ANON_KEY
@@ -851,39 +3771,140 @@ Setup:
         return
 
     command = sys.argv[1]
+    report_path = pop_option('--report')
 
+    global _catalog_cache_enabled, _catalog_cache_rebuild
+    reset_run_state()
+    _catalog_cache_enabled = not pop_flag('--no-cache')
+    _catalog_cache_rebuild = pop_flag('--refresh')
+    started = time.perf_counter()
+    try:
+        run_command(command)
+    finally:
+        save_mockup_index()
+        if command not in READ_ONLY_COMMANDS:
+            try:
+                mark_catalog_cache_stale()
+            except Exception as e:
+                print(f"[!]  Could not mark the catalog cache stale: {e}")
+        elapsed = time.perf_counter() - started
+        # list and batch may be writing JSON/CSV to stdout, so keep their timings out of it
+        log = sys.stderr if command in ('list', 'batch') else sys.stdout
+        print_metrics(elapsed, file=log)
+        if report_path:
+            write_metrics_report(report_path, command, elapsed)
+            print(f"[INFO] Wrote metrics report to {report_path}", file=log)
+
+def run_command(command):
+    """Run one command, reading its arguments from sys.argv"""
     if command == 'sync-config':
-        sync_from_config()
+        sync_from_config(
+            jobs=pop_jobs(),
+            force=pop_flag('--force'),
+            batch_size=pop_batch_size(),
+            optimize=pop_flag('--optimize'),
+            dedupe=pop_flag('--dedupe'),
+            product_jobs=pop_product_jobs(),
+            resume=pop_flag('--resume'),
+            plan=pop_flag('--plan')
+        )
+    elif command == 'watch':
+        debounce = pop_option('--debounce', WATCH_DEBOUNCE)
+        try:
+            debounce = max(0.0, float(debounce))
+        except ValueError:
+            print(f"[!]  Invalid --debounce value: {debounce}, using {WATCH_DEBOUNCE}")
+            debounce = WATCH_DEBOUNCE
+        watch_config(
+            debounce=debounce,
+            poll=pop_flag('--poll'),
+            jobs=pop_jobs(),
+            batch_size=pop_batch_size(),
+            optimize=pop_flag('--optimize'),
+            dedupe=pop_flag('--dedupe'),
+            product_jobs=pop_product_jobs()
+        )
     elif command == 'sync':
-        sync_products()
+        sync_products(batch_size=pop_batch_size())
     elif command == 'clean':
-        clean_products()
+        delete = pop_flag('--delete')
+        dry_run = pop_flag('--dry-run')
+        clean_products(sys.argv[2] if len(sys.argv) > 2 else None, delete=delete, dry_run=dry_run)
     elif command == 'list':
-        list_products()
+        output_format = 'json' if pop_flag('--json') else 'csv' if pop_flag('--csv') else 'table'
+        active = True if pop_flag('--active') else False if pop_flag('--inactive') else None
+        tags = pop_option('--tag')
+        list_products(
+            category=pop_option('--category'),
+            tags=[tag.strip() for tag in tags.split(',') if tag.strip()] if tags else None,
+            active=active,
+            sku_prefix=pop_option('--sku-prefix'),
+            search=pop_option('--search'),
+            output_format=output_format
+        )
+    elif command == 'import-skus':
+        batch_size = pop_int_option('--batch-size', QIKINK_IMPORT_BATCH_SIZE)
+        dry_run = pop_flag('--dry-run')
+        csv_path = sys.argv[2] if len(sys.argv) > 2 else 'Qikink_skus.csv'
+        import_qikink_skus(csv_path, batch_size=batch_size, dry_run=dry_run)
     elif command == 'delete':
-        if len(sys.argv) < 3:
-            print("[X] Usage: delete <product_id>")
+        dry_run = pop_flag('--dry-run')
+        selector = pop_selector(lambda args: args[0] if args else None)
+        if not selector:
+            print("[X] Usage: delete <product_id> | delete <selector> [--dry-run]")
             return
 
-        product_id = sys.argv[2]
-        delete_product(product_id)
+        delete_products(selector, dry_run=dry_run)
     elif command == 'add-sizes':
-        if len(sys.argv) < 4:
-            print("[X] Usage: add-sizes <product_id> <sizes>")
+        dry_run = pop_flag('--dry-run')
+        selector = pop_selector(lambda args: args[0] if len(args) > 1 else None)
+        if not selector or len(sys.argv) < 3:
+            print("[X] Usage: add-sizes <product_id> <sizes> | add-sizes <sizes> <selector> [--dry-run]")
             print("    Example: add-sizes 123 'S,M,L,XL,XXL'")
+            print("    Example: add-sizes 'S,M,L,XL,XXL' --category hoodies")
             return
 
-        product_id = sys.argv[2]
-        sizes_str = sys.argv[3]
-        add_sizes(product_id, sizes_str)
+        sizes_str = sys.argv[-1]
+        add_sizes(selector, sizes_str, dry_run=dry_run)
     elif command == 'remove-sizes':
-        if len(sys.argv) < 3:
-            print("[X] Usage: remove-sizes <product_id>")
+        dry_run = pop_flag('--dry-run')
+        selector = pop_selector(lambda args: args[0] if args else None)
+        if not selector:
+            print("[X] Usage: remove-sizes <product_id> | remove-sizes <selector> [--dry-run]")
             return
 
-        product_id = sys.argv[2]
-        remove_sizes(product_id)
+        remove_sizes(selector, dry_run=dry_run)
+    elif command == 'batch':
+        batch_size = pop_batch_size()
+        dry_run = pop_flag('--dry-run')
+        jobs = pop_jobs()
+        if not run_batch(sys.argv[2] if len(sys.argv) > 2 else None, batch_size=batch_size, dry_run=dry_run, jobs=jobs):
+            sys.exit(1)
+    elif command == 'gc-storage':
+        grace = pop_option('--grace', GC_GRACE_HOURS)
+        try:
+            grace = max(0.0, float(grace))
+        except ValueError:
+            print(f"[!]  Invalid --grace value: {grace}, using {GC_GRACE_HOURS}")
+            grace = GC_GRACE_HOURS
+        dry_run = pop_flag('--dry-run')
+        if not gc_storage(grace, dry_run=dry_run, jobs=pop_jobs()):
+            sys.exit(1)
+    elif command == 'export':
+        tables = pop_snapshot_tables()
+        if not export_catalog(sys.argv[2] if len(sys.argv) > 2 else None, tables):
+            sys.exit(1)
+    elif command == 'import':
+        tables = pop_snapshot_tables()
+        batch_size = pop_int_option('--batch-size', SNAPSHOT_BATCH_SIZE)
+        dry_run = pop_flag('--dry-run')
+        if len(sys.argv) < 3:
+            print("[X] Usage: import <snapshot.ndjson.gz> [--tables t1,t2] [--batch-size N] [--dry-run]")
+            sys.exit(1)
+        if not import_catalog(sys.argv[2], batch_size=batch_size, dry_run=dry_run, tables=tables):
+            sys.exit(1)
     elif command == 'append':
+        jobs = pop_jobs()
         if len(sys.argv) < 5:
             print("[X] Usage: append <mockup_dir> <name> <price> [description] [category] [tags]")
             return
@@ -895,17 +3916,19 @@ Setup:
         category = sys.argv[6] if len(sys.argv) > 6 else "hoodies"
         tags = sys.argv[7].split(',') if len(sys.argv) > 7 else []
 
-        append_product_from_mockups(mockup_dir, name, description, price, category, tags)
+        append_product_from_mockups(mockup_dir, name, description, price, category, tags, jobs=jobs)
     elif command == 'update':
-        if len(sys.argv) < 4:
+        dry_run = pop_flag('--dry-run')
+        selector = pop_selector(lambda args: args[0] if args and '=' not in args[0] else None)
+        if not selector or len(sys.argv) < 3:
             print("[X] Usage: update <product_id> <field>=<value> [<field>=<value> ...]")
+            print("       update <selector> <field>=<value> [...] [--dry-run]")
             return
 
-        product_id = sys.argv[2]
         updates = {}
 
         # Parse field=value pairs
-        for arg in sys.argv[3:]:
+        for arg in sys.argv[3 if selector.get('ids') else 2:]:
             if '=' in arg:
                 field, value = arg.split('=', 1)
 
@@ -917,9 +3940,9 @@ Setup:
             else:
                 print(f"[!]  Skipping invalid argument: {arg}")
 
-        update_product(product_id, **updates)
+        update_products(selector, updates, dry_run=dry_run)
     else:
-        print("[X] Invalid command. Use 'sync', 'clean', 'list', 'delete', 'add-sizes', 'remove-sizes', 'append', or 'update'")
+        print("[X] Invalid command. Use 'sync-config', 'watch', 'sync', 'clean', 'list', 'import-skus', 'delete', 'add-sizes', 'remove-sizes', 'append', 'update', 'batch', 'gc-storage', 'export', or 'import'")
 
 if __name__ == '__main__':
     main()
\ No newline at end of file